@@ -5,6 +5,21 @@ import argparse
 import json
 from jinja2 import Environment, FileSystemLoader
 
+try:
+    # Optional: orjson parses large --vars payloads several times faster
+    import orjson  # type: ignore # optional
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _loads(text):
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # not strict JSON (e.g. NaN): let json accept it or report it
+    return json.loads(text)
+
 
 class Orbyte:
     def __init__(self, prompts_path=None, default_locale="en"):
@@ -13,6 +28,8 @@ class Orbyte:
         self.prompts_path = prompts_path or env_path or "prompts"
         self.default_locale = default_locale
         self.env = Environment(loader=FileSystemLoader(self.prompts_path))
+        # directory -> (mtime, file names); refreshed when the directory changes
+        self._listings = {}
 
     def render(self, identifier, locale=None, **kwargs):
         template_name = self._find_template(identifier, locale)
@@ -22,22 +39,33 @@ class Orbyte:
         template = self.env.get_template(template_name)
         return template.render(**kwargs)
 
+    def _listing(self, directory):
+        # One directory scan instead of a stat() per candidate name
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return set()
+        cached = self._listings.get(directory)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, set(os.listdir(directory)))
+            self._listings[directory] = cached
+        return cached[1]
+
     def _find_template(self, identifier, locale):
+        candidates = []
         # 1. Requested locale
         if locale:
-            template_name = f"{identifier}.{locale}.j2"
-            if os.path.exists(os.path.join(self.prompts_path, template_name)):
-                return template_name
-
+            candidates.append(f"{identifier}.{locale}.j2")
         # 2. Default locale
-        template_name = f"{identifier}.{self.default_locale}.j2"
-        if os.path.exists(os.path.join(self.prompts_path, template_name)):
-            return template_name
-
+        candidates.append(f"{identifier}.{self.default_locale}.j2")
         # 3. Fallback
-        template_name = f"{identifier}.j2"
-        if os.path.exists(os.path.join(self.prompts_path, template_name)):
-            return template_name
+        candidates.append(f"{identifier}.j2")
+
+        subdir = os.path.dirname(identifier)
+        listing = self._listing(os.path.join(self.prompts_path, subdir))
+        for template_name in candidates:
+            if os.path.basename(template_name) in listing:
+                return template_name
 
         return None
 
@@ -65,8 +93,8 @@ def main():
 
     if args.vars:
         try:
-            template_vars = json.loads(args.vars)
-        except json.JSONDecodeError:
+            template_vars = _loads(args.vars)
+        except json.JSONDecodeError:  # orjson's error subclasses this
             print("Error: Invalid JSON format for --vars.")
             exit(1)
     else:
@@ -1,6 +1,23 @@
-from .core import Orbyte
+import importlib
+from typing import TYPE_CHECKING
+
 from .exceptions import TemplateLookupError, MissingVariableError
-from .env import create_env
+
+if TYPE_CHECKING:
+    from .core import Orbyte
+    from .env import create_env
 
 __all__ = ["Orbyte", "TemplateLookupError", "MissingVariableError", "create_env"]
 __version__ = "0.1.0"
+
+# Public names whose modules import jinja2: loaded on first access so that
+# `import orbyte.cli` (and `orbyte --help`) starts without it.
+_LAZY = {"Orbyte": ".core", "create_env": ".env"}
+
+
+def __getattr__(name: str) -> object:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
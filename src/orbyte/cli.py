@@ -1,16 +1,17 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
-import runpy
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 import typer
 
-from .core import Orbyte
-
 from .validation import OrbyteConfigError, assert_valid_paths
 
+if TYPE_CHECKING:
+    from .core import Orbyte
+
 
 app = typer.Typer(
     add_completion=False,
@@ -29,12 +30,25 @@ def _resolve_paths(prompts_paths: Optional[List[str]]) -> List[str]:
     return paths
 
 
+# filters_path -> (st_mtime_ns, module namespace), so an unchanged filters file
+# is executed once per process rather than once per invocation. An edited file
+# replaces its entry instead of leaving the old namespace behind.
+_filters_cache: Dict[str, Tuple[int, Dict[str, object]]] = {}
+
+
 def _load_filters(filters_path: Optional[str]) -> Optional[Dict[str, object]]:
     if not filters_path:
         return None
-    if not os.path.exists(filters_path):
+    try:
+        mtime = os.stat(filters_path).st_mtime_ns
+    except OSError:
         raise OrbyteConfigError(f"Filters file not found: {filters_path}")
-    ns = runpy.run_path(filters_path)
+    cached = _filters_cache.get(filters_path)
+    if cached is None or cached[0] != mtime:
+        import runpy  # only needed when --filters is given
+
+        cached = _filters_cache[filters_path] = (mtime, runpy.run_path(filters_path))
+    ns = cached[1]
     if "FILTERS" in ns and isinstance(ns["FILTERS"], dict):
         return ns["FILTERS"]
     if "get_filters" in ns and callable(ns["get_filters"]):
@@ -62,15 +76,22 @@ def _load_translations(
     return Translations.load(gettext_dir, [use_locale])
 
 
+@functools.lru_cache(maxsize=8)
 def _build_orbyte(
-    prompts_paths: List[str],
+    prompts_paths: Tuple[str, ...],
     default_locale: str,
     locale: Optional[str],
     sandbox: bool,
     bytecode_cache_dir: Optional[str],
     filters_path: Optional[str],
     gettext_dir: Optional[str],
+    production: bool = False,
 ) -> Orbyte:
+    # Cached on the full argument tuple so repeated invocations in one process
+    # (batch scripts, `serve`) reuse the Environment and its compiled templates.
+    # Deferred: core pulls in jinja2, which `--help` and usage errors never need
+    from .core import Orbyte
+
     extra_filters = _load_filters(filters_path)
     translations = _load_translations(gettext_dir, locale, default_locale)
     return Orbyte(
@@ -80,6 +101,7 @@ def _build_orbyte(
         sandbox=sandbox,
         bytecode_cache_dir=bytecode_cache_dir,
         extra_filters=extra_filters,
+        production=production,
     )
 
 
@@ -116,11 +138,23 @@ def list_cmd(
         "--gettext-dir",
         help="Directory containing gettext .mo files (Babel).",
     ),
+    production: bool = typer.Option(
+        False,
+        "--production/--no-production",
+        help="Skip template auto-reload checks and enable a bytecode cache.",
+    ),
 ):
     """List available identifiers."""
     paths = _resolve_paths(prompts_path)
     ob = _build_orbyte(
-        paths, default_locale, None, sandbox, bytecode_cache_dir, filters, gettext_dir
+        tuple(paths),
+        default_locale,
+        None,
+        sandbox,
+        bytecode_cache_dir,
+        filters,
+        gettext_dir,
+        production,
     )
     for ident in ob.list_identifiers(recursive=recursive):
         typer.echo(ident)
@@ -158,11 +192,24 @@ def explain(
         "--gettext-dir",
         help="Directory containing gettext .mo files (Babel).",
     ),
+    production: bool = typer.Option(
+        False,
+        "--production/--no-production",
+        help="Skip template auto-reload checks and enable a bytecode cache.",
+    ),
 ):
     """Explain which file will be used and show the fallback chain."""
     paths = _resolve_paths(prompts_path)
     ob = _build_orbyte(
-        paths, default_locale, locale, sandbox, bytecode_cache_dir, filters, gettext_dir
+        tuple(paths),
+        default_locale,
+        # Only translations depend on the locale; don't key the cache on it otherwise
+        locale if gettext_dir else None,
+        sandbox,
+        bytecode_cache_dir,
+        filters,
+        gettext_dir,
+        production,
     )
     info = ob.explain(identifier, locale=locale)
     typer.echo(json.dumps(info, indent=2))
@@ -201,17 +248,139 @@ def render(
         "--gettext-dir",
         help="Directory containing gettext .mo files (Babel).",
     ),
+    production: bool = typer.Option(
+        False,
+        "--production/--no-production",
+        help="Skip template auto-reload checks and enable a bytecode cache.",
+    ),
 ):
     """Render a template."""
     paths = _resolve_paths(prompts_path)
     ob = _build_orbyte(
-        paths, default_locale, locale, sandbox, bytecode_cache_dir, filters, gettext_dir
+        tuple(paths),
+        default_locale,
+        # Only translations depend on the locale; don't key the cache on it otherwise
+        locale if gettext_dir else None,
+        sandbox,
+        bytecode_cache_dir,
+        filters,
+        gettext_dir,
+        production,
     )
-    data = Orbyte.parse_vars(vars or "{}")
+    data = ob.parse_vars(vars or "{}")
     output = ob.render(identifier, data, locale=locale)
     typer.echo(output)
 
 
+@app.command()
+def precompile(
+    target: str = typer.Argument(
+        ..., help="Output zip file (or directory with --no-zip)."
+    ),
+    zip: bool = typer.Option(True, "--zip/--no-zip", help="Write a zip archive."),
+    prompts_path: List[str] = typer.Option(
+        None,
+        "--prompts-path",
+        help="One or more paths to prompts directories (can repeat).",
+    ),
+    default_locale: str = typer.Option(
+        "en",
+        "--default-locale",
+        help="Default locale for fallback resolution.",
+    ),
+    sandbox: bool = typer.Option(
+        False,
+        "--sandbox/--no-sandbox",
+        help="Render with Jinja2 SandboxedEnvironment (for untrusted templates).",
+    ),
+    filters: Optional[str] = typer.Option(
+        None,
+        "--filters",
+        help="Path to a Python file exporting FILTERS or get_filters().",
+    ),
+    gettext_dir: Optional[str] = typer.Option(
+        None,
+        "--gettext-dir",
+        help="Directory containing gettext .mo files (Babel).",
+    ),
+):
+    """Compile all templates ahead of time (load them via ORBYTE_COMPILED_DIR)."""
+    paths = _resolve_paths(prompts_path)
+    ob = _build_orbyte(
+        tuple(paths),
+        default_locale,
+        None,
+        sandbox,
+        None,
+        filters,
+        gettext_dir,
+    )
+    ob.precompile(target, zip="deflated" if zip else None)
+    typer.echo(f"Compiled templates written to {target}")
+
+
+@app.command()
+def serve(
+    socket_path: str = typer.Option(
+        "orbyte.sock", "--socket", help="Path of the UNIX socket to listen on."
+    ),
+    prompts_path: List[str] = typer.Option(
+        None,
+        "--prompts-path",
+        help="One or more paths to prompts directories (can repeat).",
+    ),
+    default_locale: str = typer.Option(
+        "en",
+        "--default-locale",
+        help="Default locale for fallback resolution.",
+    ),
+    sandbox: bool = typer.Option(
+        False,
+        "--sandbox/--no-sandbox",
+        help="Render with Jinja2 SandboxedEnvironment (for untrusted templates).",
+    ),
+    bytecode_cache_dir: Optional[str] = typer.Option(
+        None, "--bytecode-cache-dir", help="Directory for Jinja2 bytecode cache."
+    ),
+    filters: Optional[str] = typer.Option(
+        None,
+        "--filters",
+        help="Path to a Python file exporting FILTERS or get_filters().",
+    ),
+    production: bool = typer.Option(
+        False,
+        "--production/--no-production",
+        help="Skip template auto-reload checks and enable a bytecode cache.",
+    ),
+):
+    """Serve renders over a UNIX socket (one JSON request per line)."""
+    from .server import create_server
+
+    paths = _resolve_paths(prompts_path)
+    ob = _build_orbyte(
+        tuple(paths),
+        default_locale,
+        None,
+        sandbox,
+        bytecode_cache_dir,
+        filters,
+        # No --gettext-dir: a catalog is loaded for one locale, but a single
+        # Orbyte serves requests in every locale.
+        None,
+        production,
+    )
+    server = create_server(socket_path, ob)
+    typer.echo(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
 def main():
     app()
 
@@ -1,16 +1,42 @@
 from __future__ import annotations
 
 import json
+import mmap
+import os
 from pathlib import Path
-from typing import Iterable, Mapping, Optional
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
-from jinja2 import UndefinedError
+from jinja2 import FileSystemLoader, Template, UndefinedError
 
-from .env import create_env
+from .env import CachedFileSystemLoader, create_env
 from .exceptions import MissingVariableError, TemplateLookupError
-from .resolver import PromptResolver
+from .resolver import PromptResolver, is_template_name
 
-from .validation import assert_valid_paths, assert_mapping, OrbyteConfigError
+from .validation import (
+    assert_valid_identifiers,
+    assert_valid_paths,
+    assert_mapping,
+    OrbyteConfigError,
+)
+
+try:
+    # Optional: orjson parses large --vars payloads several times faster
+    import orjson  # type: ignore # optional
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Vars files at least this large are parsed from an mmap (orjson only; it reads
+# the mapping in place, while json.loads would need a bytes copy anyway).
+_MMAP_VARS_THRESHOLD = 64 * 1024
+
+# Upper bound for the (identifier, locale) -> loader name cache.
+_LOOKUP_CACHE_SIZE = 1024
+
+# (identifier, variables, locale) as accepted by Orbyte.render_many.
+RenderItem = Tuple[str, Optional[Mapping[str, object]], Optional[str]]
+
+# Renderer returned by Orbyte.prepare: variables -> output.
+PreparedRender = Callable[[Optional[Mapping[str, object]]], str]
 
 
 class Orbyte:
@@ -19,7 +45,7 @@ class Orbyte:
 
     Parameters
     ----------
-    prompts_paths : Iterable[str]
+    prompts_paths : Iterable[str | os.PathLike]
         One or more directories to search for templates.
     default_locale : str
         Default locale used in the fallback chain.
@@ -31,36 +57,71 @@ class Orbyte:
         Directory for Jinja2 bytecode cache (perf in prod).
     extra_filters : Optional[Mapping[str, object]]
         Custom Jinja2 filters to install into the environment.
+    production : bool
+        Disable template auto-reload and enable a bytecode cache by default
+        (also enabled by `ORBYTE_ENV=prod`).
     """
 
+    __slots__ = (
+        "search_paths",
+        "_resolved_bases",
+        "_resolved_bases_str",
+        "resolver",
+        "env",
+        "default_locale",
+        "_lookup_cache",
+        "_tpl_cache",
+        "__weakref__",
+    )
+
     def __init__(
         self,
-        prompts_paths: Iterable[str],
+        prompts_paths: Iterable[Union[str, os.PathLike[str]]],
         default_locale: str = "en",
         *,
         translations=None,
         sandbox: bool = False,
         bytecode_cache_dir: Optional[str] = None,
         extra_filters: Optional[Mapping[str, object]] = None,
+        production: bool = False,
     ) -> None:
         self.search_paths = [Path(p) for p in prompts_paths]
         assert_valid_paths(prompts_paths)
+        # Search paths don't change: resolve (realpath) them once, not per render.
+        self._resolved_bases: List[Path] = [b.resolve() for b in self.search_paths]
+        # String prefixes for the _to_loader_name fast path (no PurePath churn)
+        self._resolved_bases_str: List[str] = [
+            os.path.join(str(b), "") for b in self._resolved_bases
+        ]
 
-        self.resolver = PromptResolver(prompts_paths, default_locale=default_locale)
         self.env = create_env(
             prompts_paths,
             translations=translations,
             sandbox=sandbox,
             bytecode_cache_dir=bytecode_cache_dir,
             extra_filters=extra_filters,
+            production=production,
+        )
+        # Without auto-reload, resolutions are memoized like compiled templates
+        self.resolver = PromptResolver(
+            prompts_paths, default_locale=default_locale, cache=not self.env.auto_reload
         )
         self.default_locale = default_locale
+        # (identifier, locale) -> loader name; only filled when auto_reload is off
+        self._lookup_cache: Dict[Tuple[str, Optional[str]], str] = {}
+        # loader name -> Template, skipping env.get_template (mtime-checked
+        # when auto_reload is on)
+        self._tpl_cache: Dict[str, Template] = {}
 
     def _to_loader_name(self, absolute_path: Path) -> str:
-        abs_path = absolute_path.resolve()
-        for base in self.search_paths:
+        abs_str = os.path.realpath(absolute_path)
+        for base_str in self._resolved_bases_str:
+            if abs_str.startswith(base_str):
+                return abs_str[len(base_str) :].replace(os.sep, "/")
+        abs_path = Path(abs_str)
+        for resolved_base in self._resolved_bases:
             try:
-                rel = abs_path.relative_to(base.resolve())
+                rel = abs_path.relative_to(resolved_base)
                 return rel.as_posix()
             except ValueError:
                 continue
@@ -69,27 +130,149 @@ class Orbyte:
             + ", ".join(str(b) for b in self.search_paths)
         )
 
-    def render(
-        self,
-        identifier: str,
-        variables: Mapping[str, object] | None = None,
-        locale: Optional[str] = None,
-    ) -> str:
-        assert_mapping("variables", variables)
+    def _lookup(self, identifier: str, locale: Optional[str]) -> str:
+        """Resolve `identifier`/`locale` to the name the Jinja loader expects."""
+        key = (identifier, locale)
+        name = self._lookup_cache.get(key)
+        if name is not None:
+            return name
 
         res = self.resolver.resolve(identifier, locale=locale)
         if res.chosen is None:
             raise TemplateLookupError(
                 f"Template not found. Tried: {', '.join(str(c) for c in res.candidates)}"
             )
+        name = self._to_loader_name(res.chosen)
+
+        # With auto_reload on, new locale files must be picked up; otherwise
+        # (production) the answer can't change, so keep it.
+        if not self.env.auto_reload:
+            if len(self._lookup_cache) >= _LOOKUP_CACHE_SIZE:
+                del self._lookup_cache[next(iter(self._lookup_cache))]
+            self._lookup_cache[key] = name
+        return name
+
+    def _get_template(self, identifier: str, locale: Optional[str]) -> Template:
+        return self._template(self._lookup(identifier, locale))
+
+    def _template(self, name: str) -> Template:
+        template = self._tpl_cache.get(name)
+        # With auto-reload on, a cached template is reused while its source
+        # mtime is unchanged (one stat) instead of going through the loader.
+        if template is None or (self.env.auto_reload and not template.is_up_to_date):
+            template = self.env.get_template(name)
+            self._tpl_cache[name] = template
+        return template
+
+    def clear_template_cache(self) -> None:
+        """
+        Forget cached lookups and compiled templates.
+
+        Only needed with auto-reload off (production mode), e.g. after
+        deploying new templates into a running process.
+        """
+        self._lookup_cache.clear()
+        self._tpl_cache.clear()
+        self.resolver.clear_cache()
+        if self.env.cache is not None:
+            self.env.cache.clear()
+        loader = self.env.loader
+        for sub in getattr(loader, "loaders", [loader]):
+            if isinstance(sub, CachedFileSystemLoader):
+                sub.clear()
 
+    def render(
+        self,
+        identifier: str,
+        variables: Mapping[str, object] | None = None,
+        locale: Optional[str] = None,
+    ) -> str:
+        if __debug__:  # type check only; stripped under `python -O`
+            assert_mapping("variables", variables)
+
+        template = self._get_template(identifier, locale)
         try:
-            name_for_loader = self._to_loader_name(res.chosen)
-            template = self.env.get_template(name_for_loader)
-            return template.render(**(variables or {}))
+            return template.render(variables or {})
         except UndefinedError as e:
             raise MissingVariableError(str(e)) from e
 
+    def render_many(self, items: Iterable[RenderItem]) -> List[str]:
+        """
+        Render `(identifier, variables, locale)` items, returning outputs in order.
+
+        Each distinct (identifier, locale) pair is resolved and loaded once per
+        batch, so bulk jobs over a few templates skip the per-item lookup.
+        """
+        items = list(items)
+        # Reject a bad identifier before rendering anything
+        assert_valid_identifiers([identifier for identifier, _, _ in items])
+        templates: Dict[Tuple[str, Optional[str]], Template] = {}
+        outputs: List[str] = []
+        for identifier, variables, locale in items:
+            if __debug__:
+                assert_mapping("variables", variables)
+            key = (identifier, locale)
+            template = templates.get(key)
+            if template is None:
+                template = templates[key] = self._get_template(identifier, locale)
+            try:
+                outputs.append(template.render(variables or {}))
+            except UndefinedError as e:
+                raise MissingVariableError(str(e)) from e
+        return outputs
+
+    def prepare(self, identifier: str, locale: Optional[str] = None) -> PreparedRender:
+        """
+        Resolve and compile `identifier` once; return a `variables -> str` renderer.
+
+        Lookup errors are raised here rather than on the first call. With
+        auto-reload off the compiled template is bound into the renderer, so
+        calls skip resolution entirely; call `prepare` again after
+        `clear_template_cache()`. With auto-reload on, each call goes through
+        `render` so template edits and new locale files are still picked up.
+        """
+        template = self._get_template(identifier, locale)
+
+        if self.env.auto_reload:
+
+            def render_prepared(variables: Optional[Mapping[str, object]] = None) -> str:
+                return self.render(identifier, variables, locale)
+
+            return render_prepared
+
+        def render_bound(variables: Optional[Mapping[str, object]] = None) -> str:
+            if __debug__:
+                assert_mapping("variables", variables)
+            try:
+                return template.render(variables or {})
+            except UndefinedError as e:
+                raise MissingVariableError(str(e)) from e
+
+        return render_bound
+
+    def precompile(self, target: str, zip: Optional[str] = "deflated") -> None:
+        """
+        Compile every template under the search paths into `target`.
+
+        With `zip` set, `target` is a zip archive, otherwise a directory. Point
+        `ORBYTE_COMPILED_DIR` at it to load the compiled modules instead of
+        parsing sources on first render.
+        """
+        # Always compile from the sources, even if this env already prefers
+        # a compiled dir (ModuleLoader cannot list its templates).
+        env = self.env.overlay(
+            loader=FileSystemLoader([str(p) for p in self.search_paths])
+        )
+        env.compile_templates(
+            target,
+            extensions=None,
+            # Only templates: READMEs, assets and .git/* need not even parse
+            filter_func=is_template_name,
+            zip=zip,
+            log_function=None,
+            ignore_errors=False,
+        )
+
     def explain(self, identifier: str, locale: Optional[str] = None) -> dict:
         res = self.resolver.resolve(identifier, locale=locale)
         return {
@@ -99,8 +282,8 @@ class Orbyte:
             "chosen": str(res.chosen) if res.chosen else None,
         }
 
-    def list_identifiers(self, *, recursive: bool = True) -> list[str]:
-        return self.resolver.list_identifiers(recursive=recursive)
+    def list_identifiers(self, *, recursive: bool = True, sort: bool = True) -> list[str]:
+        return self.resolver.list_identifiers(recursive=recursive, sort=sort)
 
     @staticmethod
     def parse_vars(value: str) -> dict:
@@ -110,8 +293,7 @@ class Orbyte:
         if v.startswith("@"):
             path = v[1:]
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return _load_vars_file(path)
             except FileNotFoundError as e:
                 raise OrbyteConfigError(f"Vars file not found: {path}") from e
             except json.JSONDecodeError as e:
@@ -119,8 +301,29 @@ class Orbyte:
                     f"Vars file is not valid JSON: {path} (line {e.lineno})"
                 ) from e
         try:
-            return json.loads(v)
-        except json.JSONDecodeError as e:
+            return _loads(v)
+        except json.JSONDecodeError as e:  # orjson's error subclasses this
             raise OrbyteConfigError(
                 f"--vars must be valid JSON or @file.json (line {e.lineno})"
             ) from e
+
+
+def _loads(data: Union[str, bytes, memoryview]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Not strict JSON (e.g. NaN, Infinity): json accepts those, and for
+            # real syntax errors it raises the same error type itself.
+            pass
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+def _load_vars_file(path: str) -> dict:
+    # Bytes straight to the parser: no separate decode pass
+    with open(path, "rb") as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < _MMAP_VARS_THRESHOLD:
+            return _loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _loads(view)
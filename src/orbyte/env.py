@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from typing import Iterable, Mapping, Optional, Union
+import mmap
+import os
+import posixpath
+import stat
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
 from jinja2 import (
+    BaseLoader,
+    ChoiceLoader,
     Environment,
     FileSystemLoader,
+    ModuleLoader,
     StrictUndefined,
-    select_autoescape,
 )
+from jinja2.loaders import split_template_path
 
 try:
     # Available in jinja2; import lazily to avoid hard dependency on sandbox unless used
@@ -25,30 +32,143 @@ except ImportError:  # pragma: no cover
     Translations = object  # type: ignore # noqa
 
 
+# html/xml templates are autoescaped, including `page.html.j2`-style names.
+_AUTOESCAPE_SUFFIXES = (".html", ".htm", ".xml", ".html.j2", ".htm.j2", ".xml.j2")
+
+# Sources at least this large are read through mmap instead of a buffered read.
+_MMAP_THRESHOLD = 64 * 1024
+
+
+def _autoescape(template_name: Optional[str]) -> bool:
+    # One endswith() over a constant tuple; string templates are never escaped.
+    if not template_name:
+        return False
+    return template_name.lower().endswith(_AUTOESCAPE_SUFFIXES)
+
+
+class CachedFileSystemLoader(FileSystemLoader):
+    """
+    `FileSystemLoader` that keeps template sources in memory once read.
+
+    With auto-reload off a cached source is served without touching the
+    filesystem; otherwise a single stat decides whether it can be reused.
+    Large files (>= 64 KiB) are decoded directly from an mmap.
+    """
+
+    def __init__(self, searchpath, encoding: str = "utf-8", followlinks: bool = False):
+        super().__init__(searchpath, encoding=encoding, followlinks=followlinks)
+        # template name -> (source, filename, mtime)
+        self._sources: Dict[str, Tuple[str, str, float]] = {}
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> Tuple[str, str, Callable[[], bool]]:
+        hit = self._sources.get(template)
+        if hit is not None:
+            source, filename, mtime = hit
+            if not environment.auto_reload or _mtime(filename) == mtime:
+                return source, filename, _uptodate(filename, mtime)
+            self._sources.pop(template, None)
+        pieces = split_template_path(template)
+        for searchpath in self.searchpath:
+            # posixpath like FileSystemLoader, so drive/UNC segments can't escape
+            filename = posixpath.join(searchpath, *pieces)
+            try:
+                st = os.stat(filename)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                break
+        else:
+            # Not found: let Jinja raise its usual TemplateNotFound
+            return super().get_source(environment, template)
+        source = _read_source(filename, st.st_size, self.encoding)
+        filename = os.path.normpath(filename)
+        self._sources[template] = (source, filename, st.st_mtime)
+        return source, filename, _uptodate(filename, st.st_mtime)
+
+    def clear(self) -> None:
+        """Drop all cached sources."""
+        self._sources.clear()
+
+
+def _read_source(filename: str, size: int, encoding: str) -> str:
+    if size < _MMAP_THRESHOLD:
+        text = str(_read_bytes(filename, size), encoding)
+    else:
+        # Large prompts: decode straight from the mapping, skipping the read buffer
+        with open(filename, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, encoding)
+    # Match text-mode reads (universal newlines)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _read_bytes(filename: str, size: int) -> bytes:
+    """Read a small file with raw fd calls, bypassing the buffered text layer."""
+    fd = os.open(filename, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        data = os.read(fd, size + 1)
+        if len(data) <= size:
+            return data
+        # Grew since the caller's stat: drain the rest
+        chunks = [data]
+        while True:
+            chunk = os.read(fd, _MMAP_THRESHOLD)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
+def _mtime(filename: str) -> Optional[float]:
+    try:
+        return os.path.getmtime(filename)
+    except OSError:
+        return None
+
+
+def _uptodate(filename: str, mtime: float) -> Callable[[], bool]:
+    return lambda: _mtime(filename) == mtime
+
+
+def is_production() -> bool:
+    """True when `ORBYTE_ENV` selects production mode (`prod`/`production`)."""
+    return os.getenv("ORBYTE_ENV", "").strip().lower() in ("prod", "production")
+
+
 def create_env(
-    templates_paths: Union[str, Iterable[str]],
+    templates_paths: Union[str, Iterable[str], BaseLoader],
     *,
     translations: Optional[Translations] = None,
     sandbox: bool = False,
     bytecode_cache_dir: Optional[str] = None,
     extra_filters: Optional[Mapping[str, object]] = None,
+    production: bool = False,
+    compiled_dir: Optional[str] = None,
 ) -> Environment:
     """
     Create a Jinja2 Environment for prompt rendering.
 
-    - Supports one or many search paths.
+    - Supports one or many search paths, or a ready-made Jinja loader
+      (e.g. a `DictLoader` for in-memory templates).
     - StrictUndefined: fail on missing vars (safer for prompts).
-    - Autoescape only for html/xml; plain .j2 remains raw.
+    - Autoescape only for html/xml (also `.html.j2` etc.); plain .j2 remains raw.
     - Optional gettext/i18n if `translations` is provided.
     - Optional sandbox (for untrusted templates).
-    - Optional bytecode cache for faster production loads.
+    - Optional bytecode cache for faster loads (`bytecode_cache_dir` or
+      `ORBYTE_BYTECODE_CACHE`).
     - Optional injection of custom filters.
+    - Template sources are kept in memory (`CachedFileSystemLoader`).
+    - Production mode (`production=True` or `ORBYTE_ENV=prod`): no auto-reload
+      stat checks, an unbounded template cache, and a bytecode cache even
+      without a directory.
+    - Precompiled templates (`compiled_dir` or `ORBYTE_COMPILED_DIR`, as written
+      by `Orbyte.precompile`) are served by a `ModuleLoader` ahead of the sources.
     """
-    if isinstance(templates_paths, str):
-        paths = [templates_paths]
-    else:
-        paths = list(templates_paths)
-
     # Choose environment class
     env_cls = Environment
     if sandbox:
@@ -58,21 +178,41 @@ def create_env(
             )
         env_cls = SandboxedEnvironment  # type: ignore[assignment]
 
+    production = production or is_production()
+
     # Optional bytecode cache
     bcc = None
-    if bytecode_cache_dir and FileSystemBytecodeCache is not None:
-        bcc = FileSystemBytecodeCache(directory=bytecode_cache_dir)
+    bytecode_cache_dir = bytecode_cache_dir or os.getenv("ORBYTE_BYTECODE_CACHE") or None
+    if FileSystemBytecodeCache is not None:
+        if bytecode_cache_dir:
+            bytecode_cache_dir = os.path.expanduser(bytecode_cache_dir)
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bcc = FileSystemBytecodeCache(directory=bytecode_cache_dir)
+        elif production:
+            # Jinja picks a private per-user temp dir; entries are keyed by
+            # template filename, so several prompt trees can share it.
+            bcc = FileSystemBytecodeCache()
+
+    loader: BaseLoader
+    if isinstance(templates_paths, BaseLoader):
+        loader = templates_paths
+    elif isinstance(templates_paths, str):
+        loader = CachedFileSystemLoader([templates_paths])
+    else:
+        loader = CachedFileSystemLoader(list(templates_paths))
+    compiled_dir = compiled_dir or os.getenv("ORBYTE_COMPILED_DIR") or None
+    if compiled_dir:
+        loader = ChoiceLoader([ModuleLoader(compiled_dir), loader])
 
     env = env_cls(
-        loader=FileSystemLoader(paths),
-        autoescape=select_autoescape(
-            enabled_extensions=("html", "htm", "xml"),
-            default_for_string=False,
-        ),
+        loader=loader,
+        autoescape=_autoescape,
         undefined=StrictUndefined,
         trim_blocks=True,
         lstrip_blocks=True,
-        auto_reload=True,
+        auto_reload=not production,
+        # Production template sets are fixed: never evict compiled templates
+        cache_size=-1 if production else 400,
         bytecode_cache=bcc,
     )
 
@@ -1,27 +1,74 @@
 from __future__ import annotations
 
+import functools
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 
-from .validation import assert_valid_identifier, normalize_locale
+from .validation import canonical_identifier, normalize_locale
 
 # locale token like: en, es, en-US, zh-Hant, pt-BR, etc.
 _LOCALE_TOKEN = r"[A-Za-z]{2,3}(?:[-_][A-Za-z0-9]{2,8})*"
 # filename stem with optional locale suffix: welcome.en, invoice.en-US, etc.
-_LOCALE_SUFFIX_RE = re.compile(rf"^(?P<base>.+?)\.(?P<loc>{_LOCALE_TOKEN})$")
+_LOCALE_SUFFIX_RE = re.compile(rf"(?P<base>.+?)\.(?P<loc>{_LOCALE_TOKEN})")
 
 _EXCLUDED_DIRS = {".git", ".hg", ".svn", "__pycache__", ".venv", "venv"}
 
+# A directory modified this recently may change again within the same mtime
+# tick, so its listing is not trusted from cache yet (cf. "racy git").
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Upper bound for memoized resolutions (oldest evicted first).
+_RESOLVE_CACHE_SIZE = 1024
+
+# Upper bound on threads used to walk several search paths at once.
+_MAX_WALK_WORKERS = 8
+
+
+def is_template_name(name: str) -> bool:
+    """
+    True for a loader name (POSIX, relative) that `list_identifiers` would see.
+
+    That is a `*.j2` file outside hidden and excluded (VCS, venv, cache)
+    directories.
+    """
+    *dirs, leaf = name.split("/")
+    return leaf.endswith(".j2") and not any(
+        d in _EXCLUDED_DIRS or d.startswith(".") for d in dirs
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _candidate_names(leaf: str, locale: str, default_locale: str) -> Tuple[str, ...]:
+    """Ranked filenames for `leaf`: locale, default locale, then plain."""
+    if locale == default_locale:
+        return (f"{leaf}.{locale}.j2", f"{leaf}.j2")
+    return (f"{leaf}.{locale}.j2", f"{leaf}.{default_locale}.j2", f"{leaf}.j2")
+
 
 @dataclass(frozen=True)
 class Resolution:
+    # Manual slots (dataclass(slots=True) needs 3.10): no per-instance __dict__
+    __slots__ = ("identifier", "locale", "candidates", "chosen")
+
     identifier: str
     locale: str
     candidates: Tuple[Path, ...]
     chosen: Optional[Path]
 
+    # Without a __dict__, copy/pickle restore state through setattr, which the
+    # frozen dataclass forbids; dataclass(slots=True) generates the same pair.
+    def __getstate__(self) -> Tuple[object, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[object, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 class PromptResolver:
     """Resolve identifier + locale to a concrete template file.
@@ -33,66 +80,149 @@ class PromptResolver:
       1) identifier.<locale>.j2
       2) identifier.<default_locale>.j2
       3) identifier.j2
+
+    With `cache=True` successful resolutions are memoized per
+    (identifier, locale) and never re-checked against the filesystem; call
+    `clear_cache()` after templates are added or removed.
     """
 
-    def __init__(self, search_paths: Iterable[str], default_locale: str = "en") -> None:
+    def __init__(
+        self,
+        search_paths: Iterable[Union[str, os.PathLike[str]]],
+        default_locale: str = "en",
+        *,
+        cache: bool = False,
+    ) -> None:
         self.search_paths: List[Path] = [Path(p) for p in search_paths]
         self.default_locale = default_locale
+        self.cache = cache
+        # directory -> (st_mtime_ns, *.j2 entry names)
+        self._dir_cache: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+        # (identifier, normalized locale) -> Resolution; only filled when `cache`
+        self._resolve_cache: Dict[Tuple[str, str], Resolution] = {}
+        # Identifiers that already passed validation, mapped to their interned form
+        self._valid_idents: Dict[str, str] = {}
+
+    def clear_cache(self) -> None:
+        """Forget memoized resolutions and directory listings."""
+        self._resolve_cache.clear()
+        self._dir_cache.clear()
+
+    def _listing(self, directory: str) -> FrozenSet[str]:
+        """`*.j2` file names in `directory`, re-scanned only when its mtime changes."""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._dir_cache.pop(directory, None)
+            return frozenset()
+        cached = self._dir_cache.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with os.scandir(directory) as it:
+                # Only template files can match a candidate; keep the cache small.
+                # is_file() answers from d_type, so this adds no stat per entry.
+                names = frozenset(
+                    e.name for e in it if e.name.endswith(".j2") and e.is_file()
+                )
+        except OSError:
+            return frozenset()
+        if time.time_ns() - mtime > _RACY_WINDOW_NS:
+            self._dir_cache[directory] = (mtime, names)
+        return names
 
     def resolve(self, identifier: str, locale: str | None = None) -> Resolution:
-        assert_valid_identifier(identifier)
+        canon = self._valid_idents.get(identifier) if type(identifier) is str else None
+        if canon is None:
+            # Invalid identifiers raise here every time and are never remembered
+            canon = canonical_identifier(identifier)
+            if len(self._valid_idents) < _RESOLVE_CACHE_SIZE:
+                self._valid_idents[canon] = canon
+        identifier = canon
         loc = normalize_locale(locale, self.default_locale)
-
-        names: List[str] = []
-        names.append(f"{identifier}.{loc}.j2")
-        if loc != self.default_locale:
-            names.append(f"{identifier}.{self.default_locale}.j2")
-        names.append(f"{identifier}.j2")
-
-        candidates: List[Path] = []
-        chosen: Optional[Path] = None
+        if not self.cache:
+            return self._resolve(identifier, loc)
+        key = (identifier, loc)
+        res = self._resolve_cache.get(key)
+        if res is None:
+            res = self._resolve(identifier, loc)
+            if res.chosen is not None:
+                if len(self._resolve_cache) >= _RESOLVE_CACHE_SIZE:
+                    del self._resolve_cache[next(iter(self._resolve_cache))]
+                self._resolve_cache[key] = res
+        return res
+
+    def _resolve(self, identifier: str, loc: str) -> Resolution:
+        # All candidates share one directory: list it once per search path and
+        # rank the expected filenames by priority (locale, default, plain).
+        subdir, _, leaf = identifier.rpartition("/")
+        filenames = _candidate_names(leaf, loc, self.default_locale)
+
+        # Candidates stay plain strings; Paths are only built for the Resolution.
+        candidates: List[str] = []
         for base in self.search_paths:
-            for name in names:
-                p = base / name
-                candidates.append(p)
-                if p.exists():
-                    chosen = p
-                    return Resolution(identifier, loc, tuple(candidates), chosen)
-        return Resolution(identifier, loc, tuple(candidates), chosen)
-
-    def list_identifiers(self, *, recursive: bool = True) -> List[str]:
+            base_str = str(base)
+            directory = os.path.join(base_str, subdir) if subdir else base_str
+            listing = self._listing(directory)
+            for filename in filenames:
+                candidates.append(os.path.join(directory, filename))
+                if filename in listing:
+                    paths = tuple(map(Path, candidates))
+                    return Resolution(identifier, loc, paths, paths[-1])
+        return Resolution(identifier, loc, tuple(map(Path, candidates)), None)
+
+    def list_identifiers(self, *, recursive: bool = True, sort: bool = True) -> List[str]:
         """
         List unique base identifiers found across search paths.
 
         - Returns identifiers with POSIX-style paths (e.g., "emails/welcome").
         - Strips locale suffix from the *filename* only (e.g., "welcome.en" -> "welcome").
         - If `recursive=False`, only looks in the top directory of each search path.
+        - If `sort=False`, skips sorting: identifiers come in discovery order
+          (search paths in order, directory entries as the filesystem lists them).
         """
-        seen: set[str] = set()
-
-        for base in self.search_paths:
-            if not base.exists():
+        # dict keys: ordered dedup across paths
+        seen: Dict[str, None] = {}
+        if len(self.search_paths) > 1:
+            # Overlap the per-directory syscalls of several roots (slow/remote disks)
+            workers = min(len(self.search_paths), _MAX_WALK_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                walk = functools.partial(self._walk_one, recursive=recursive)
+                for found in ex.map(walk, self.search_paths):
+                    seen.update(found)
+        else:
+            for base in self.search_paths:
+                seen.update(self._walk_one(base, recursive))
+        return sorted(seen) if sort else list(seen)
+
+    @staticmethod
+    def _walk_one(base: Path, recursive: bool) -> Dict[str, None]:
+        """Base identifiers (locale suffix stripped) under a single search path."""
+        seen: Dict[str, None] = {}
+        # Explicit scandir stack: the POSIX prefix is carried along instead of
+        # recomputed with relpath, and hidden/excluded dirs are never entered.
+        # Like os.walk, symlinked directories are not followed.
+        stack = [(str(base), "")]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                it = os.scandir(directory)
+            except OSError:
                 continue
-
-            it = base.rglob("*.j2") if recursive else base.glob("*.j2")
-            for p in it:
-                rel = p.relative_to(base)
-
-                # skip hidden/excluded dirs
-                parts = rel.parts[:-1]  # parent dirs only
-                if any(part in _EXCLUDED_DIRS or part.startswith(".") for part in parts):
-                    continue
-
-                # remove .j2 and locale suffix from the *filename*
-                stem = p.stem
-                m = _LOCALE_SUFFIX_RE.match(stem)
-                base_name = m.group("base") if m else stem
-
-                # rebuild the identifier using parent dirs + base_name (POSIX separators)
-                parent = rel.parent
-                ident_path = (
-                    (parent / base_name) if str(parent) != "." else Path(base_name)
-                )
-                seen.add(ident_path.as_posix())
-
-        return sorted(seen)
+            with it:
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir():
+                        if (
+                            recursive
+                            and not entry.is_symlink()
+                            and name not in _EXCLUDED_DIRS
+                            and not name.startswith(".")
+                        ):
+                            stack.append((entry.path, prefix + name + "/"))
+                    elif name.endswith(".j2"):
+                        # remove .j2 and locale suffix from the *filename*
+                        stem = name[:-3]
+                        m = _LOCALE_SUFFIX_RE.fullmatch(stem)
+                        seen[prefix + (m.group("base") if m else stem)] = None
+        return seen
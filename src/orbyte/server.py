@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import socketserver
+import stat
+from typing import Mapping
+
+from .core import Orbyte
+from .validation import OrbyteConfigError
+
+try:
+    # Only defined on platforms with AF_UNIX support
+    from socketserver import ThreadingUnixStreamServer
+except ImportError:  # pragma: no cover
+    ThreadingUnixStreamServer = None  # type: ignore # noqa
+
+
+def handle_request(ob: Orbyte, request: Mapping[str, object]) -> dict:
+    """
+    Render a single `{identifier, vars, locale}` request.
+
+    Returns `{"ok": true, "output": ...}` on success, or
+    `{"ok": false, "error": ..., "type": ...}` so one bad request never
+    takes the daemon down.
+    """
+    try:
+        if not isinstance(request, Mapping):
+            raise OrbyteConfigError("Request must be a JSON object.")
+        output = ob.render(
+            request.get("identifier"),  # type: ignore[arg-type]
+            request.get("vars") or {},  # type: ignore[arg-type]
+            locale=request.get("locale"),  # type: ignore[arg-type]
+        )
+    except Exception as e:
+        return {"ok": False, "error": str(e), "type": type(e).__name__}
+    return {"ok": True, "output": output}
+
+
+class _RenderHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON: one request per line, one reply per line."""
+
+    def __init__(self, request, client_address, server, *, orbyte: Orbyte) -> None:
+        self.orbyte = orbyte
+        super().__init__(request, client_address, server)
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                reply = {
+                    "ok": False,
+                    "error": f"Invalid JSON: {e}",
+                    "type": "JSONDecodeError",
+                }
+            else:
+                reply = handle_request(self.orbyte, request)
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+def create_server(socket_path: str, ob: Orbyte) -> socketserver.BaseServer:
+    """
+    Bind a threaded UNIX-socket server that renders through a single `Orbyte`.
+
+    Keeping one instance alive means the Jinja environment (and its compiled
+    templates) is reused across requests instead of being rebuilt per call.
+    A stale socket file left behind by a previous run is replaced.
+    """
+    if ThreadingUnixStreamServer is None:
+        raise OrbyteConfigError("UNIX domain sockets are not supported on this platform.")
+    try:
+        if stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+    server = ThreadingUnixStreamServer(
+        socket_path, functools.partial(_RenderHandler, orbyte=ob)
+    )
+    server.daemon_threads = True
+    return server
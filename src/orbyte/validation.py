@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import functools
+import os
 import re
-from pathlib import Path
-from typing import Iterable, Mapping
+import stat
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
 
 
 class OrbyteConfigError(ValueError):
     """Raised when Orbyte is misconfigured (paths/locales/identifiers)."""
 
 
-_IDENTIFIER_RE = re.compile(r"^[\w/\.\-]+$")  # letters, digits, _, -, /, .
-_LOCALE_RE = re.compile(r"^[A-Za-z]{2,3}(?:-[A-Za-z0-9]{2,8})*$")  # en, en-US, zh-Hant
+_IDENTIFIER_RE = re.compile(r"[\w/\.\-]+")  # letters, digits, _, -, /, .
+_LOCALE_RE = re.compile(r"[A-Za-z]{2,3}(?:-[A-Za-z0-9]{2,8})*")  # en, en-US, zh-Hant
+# Separators normalized to '-' in locales (en_US -> en-US)
+_LOCALE_TRANS = str.maketrans({"_": "-"})
+# Any identifier rule violation (absolute, '..' segment, .j2, bad char) in one scan
+_REJECT_RE = re.compile(r"^[\\/]|^[A-Za-z]:|(?:^|[\\/])\.\.(?:[\\/]|$)|\.j2$|[^\w\-/.]")
 
 
 def assert_valid_identifier(identifier: str) -> None:
@@ -20,50 +28,135 @@ def assert_valid_identifier(identifier: str) -> None:
       - no parent traversal ('..')
       - no trailing .j2 (users pass logical names)
       - allowed chars only
+
+    Valid string identifiers are memoized; failures are never cached.
     """
-    if not identifier or not isinstance(identifier, str):
+    if isinstance(identifier, str):
+        _assert_valid_identifier_cached(identifier)
+    else:
+        _assert_valid_identifier_impl(identifier)
+
+
+def assert_valid_identifiers(identifiers: Iterable[str]) -> None:
+    """Validate many identifiers, raising for the first invalid one."""
+    reject = _REJECT_RE.search
+    for identifier in identifiers:
+        if not isinstance(identifier, str) or not identifier or reject(identifier):
+            _assert_valid_identifier_impl(identifier)
+
+
+def canonical_identifier(identifier: str) -> str:
+    """Validate `identifier` and return its interned form (cheap dict-key compares)."""
+    assert_valid_identifier(identifier)
+    if type(identifier) is not str:
+        # str subclasses (e.g. StrEnum members) can't be interned: use their value
+        identifier = str.__str__(identifier)
+    return sys.intern(identifier)
+
+
+def _assert_valid_identifier_impl(identifier: str) -> None:
+    if not isinstance(identifier, str) or not identifier:
         raise OrbyteConfigError("Identifier must be a non-empty string.")
-    p = Path(identifier)
-    if p.is_absolute():
+    if _REJECT_RE.search(identifier) is None:
+        return
+    # Invalid: re-check rule by rule so the first failing rule is reported.
+    if identifier[:1] in ("/", "\\") or (
+        identifier[1:2] == ":" and identifier[0].isalpha()
+    ):
         raise OrbyteConfigError(f"Identifier '{identifier}' must not be absolute.")
-    if any(part == ".." for part in p.parts):
+    if ".." in identifier.replace("\\", "/").split("/"):
         raise OrbyteConfigError(f"Identifier '{identifier}' must not contain '..'.")
     if identifier.endswith(".j2"):
         raise OrbyteConfigError("Identifier must not include the '.j2' extension.")
-    if not _IDENTIFIER_RE.match(identifier):
+    if not _IDENTIFIER_RE.fullmatch(identifier):
         raise OrbyteConfigError(
             "Identifier contains unsupported characters. Allowed: letters, digits, _, -, /, ."
         )
 
 
+_assert_valid_identifier_cached = functools.lru_cache(maxsize=512)(
+    _assert_valid_identifier_impl
+)
+
+
+@functools.lru_cache(maxsize=256)
 def normalize_locale(locale: str | None, default_locale: str) -> str:
     """
     - None -> default
     - '_' to '-' (en_US -> en-US)
     - validate pattern.
+
+    Memoized: resolvers call this once per lookup with a handful of distinct values.
     """
     loc = (locale or default_locale or "").strip()
     if not loc:
         raise OrbyteConfigError("Locale cannot be empty.")
-    loc = loc.replace("_", "-")
-    if not _LOCALE_RE.match(loc):
+    loc = loc.translate(_LOCALE_TRANS)
+    # Bare language codes (en, es, fil) are the common case; skip the regex
+    if 2 <= len(loc) <= 3 and loc.isascii() and loc.isalpha():
+        return sys.intern(loc)
+    if not _LOCALE_RE.fullmatch(loc):
         raise OrbyteConfigError(
             f"Locale '{loc}' is invalid. Expected like 'en' or 'en-US'."
         )
-    return loc
+    return sys.intern(loc)
 
 
-def assert_valid_paths(paths: Iterable[str]) -> None:
-    for p in paths:
-        q = Path(p)
-        if not q.exists():
-            raise OrbyteConfigError(f"Prompts path does not exist: {p}")
-        if not q.is_dir():
+def assert_valid_paths(paths: Iterable[Union[str, os.PathLike[str]]]) -> None:
+    # Path objects are accepted like everywhere else; compare and key on strings.
+    # "" is the current directory, as for Path("") and the Jinja loader.
+    str_paths = [os.fspath(p) or os.curdir for p in paths]
+    is_dir = _scan_sibling_dirs(str_paths).get
+    # Locals, not globals, inside the loop (large ORBYTE_PROMPTS_PATH lists)
+    _stat, _isdir = os.stat, stat.S_ISDIR
+    for p in str_paths:
+        known = is_dir(p)
+        if known is None:
+            # One stat per path (Path.exists() + is_dir() would take two)
+            try:
+                st = _stat(p)
+            except OSError:
+                raise OrbyteConfigError(f"Prompts path does not exist: {p}")
+            known = _isdir(st.st_mode)
+        if not known:
             raise OrbyteConfigError(f"Prompts path is not a directory: {p}")
 
 
+def _scan_sibling_dirs(paths: List[str]) -> Dict[str, bool]:
+    """
+    `path -> is directory` for paths that share a parent with another path.
+
+    Siblings (e.g. a monorepo's `ORBYTE_PROMPTS_PATH`) are answered from one
+    scandir of their parent instead of a stat each. Paths missing from the
+    listing are left out so the caller's stat reports them.
+    """
+    groups: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    for p in paths:
+        if ".." in p:  # abspath would fold '..' lexically, ignoring symlinks
+            continue
+        full = os.path.abspath(p)
+        groups[os.path.dirname(full)].append((p, os.path.basename(full)))
+
+    found: Dict[str, bool] = {}
+    for parent, members in groups.items():
+        if len(members) < 2:
+            continue
+        try:
+            with os.scandir(parent) as it:
+                entries = {e.name: e for e in it}
+        except OSError:
+            continue
+        for p, name in members:
+            entry = entries.get(name)
+            # d_type answers is_dir() without a stat; symlinks are left to stat
+            if entry is not None and not entry.is_symlink():
+                found[p] = entry.is_dir()
+    return found
+
+
 def assert_mapping(name: str, value: Mapping | None) -> None:
-    if value is None:
+    # Plain dicts (nearly every caller) skip the Mapping ABC instance check
+    if value is None or type(value) is dict:
         return
     if not isinstance(value, Mapping):
         raise OrbyteConfigError(f"{name} must be a mapping/dict.")
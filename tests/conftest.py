@@ -15,8 +15,11 @@ from orbyte.resolver import PromptResolver
 # ---- Global safety: avoid env leakage across tests --------------------------
 @pytest.fixture(autouse=True)
 def _clear_orbyte_env(monkeypatch: pytest.MonkeyPatch):
-    """Ensure tests don't leak ORBYTE_PROMPTS_PATH across each other."""
+    """Ensure tests don't leak ORBYTE_* settings across each other."""
     monkeypatch.delenv("ORBYTE_PROMPTS_PATH", raising=False)
+    monkeypatch.delenv("ORBYTE_ENV", raising=False)
+    monkeypatch.delenv("ORBYTE_COMPILED_DIR", raising=False)
+    monkeypatch.delenv("ORBYTE_BYTECODE_CACHE", raising=False)
 
 
 # ---- Common paths & helpers --------------------------------------------------
@@ -55,19 +58,16 @@ def resolver_single_path(tmp_prompts_dir: Path) -> PromptResolver:
 
 
 # ---- CLI helper fixtures -----------------------------------------------------
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def runner() -> CliRunner:
-    """Shared Typer/Click CLI runner."""
+    """Shared Typer/Click CLI runner (stateless between invokes)."""
     return CliRunner()
 
 
 # ---- Optional: dummy Babel for gettext tests --------------------------------
-@pytest.fixture()
-def install_dummy_babel(monkeypatch: pytest.MonkeyPatch):
-    """
-    Make `from babel.support import Translations` importable without installing Babel.
-    Provides Translations.load() returning an object with gettext/ngettext.
-    """
+@pytest.fixture(scope="session")
+def _dummy_babel_modules():
+    """Build the fake `babel` / `babel.support` modules once per test session."""
     babel_mod = types.ModuleType("babel")
     support_mod = types.ModuleType("babel.support")
 
@@ -83,6 +83,16 @@ def install_dummy_babel(monkeypatch: pytest.MonkeyPatch):
             return s if n == 1 else p
 
     support_mod.Translations = DummyTranslations  # type: ignore[attr-defined]
+    return babel_mod, support_mod, DummyTranslations
+
+
+@pytest.fixture()
+def install_dummy_babel(monkeypatch: pytest.MonkeyPatch, _dummy_babel_modules):
+    """
+    Make `from babel.support import Translations` importable without installing Babel.
+    Provides Translations.load() returning an object with gettext/ngettext.
+    """
+    babel_mod, support_mod, dummy_translations = _dummy_babel_modules
     monkeypatch.setitem(sys.modules, "babel", babel_mod)
     monkeypatch.setitem(sys.modules, "babel.support", support_mod)
-    return DummyTranslations
+    return dummy_translations
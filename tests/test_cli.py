@@ -11,15 +11,23 @@ import pytest
 from orbyte.cli import app
 
 
-@pytest.fixture()
-def tmp_prompts_dir(tmp_path: Path) -> Path:
-    d = tmp_path / "prompts"
-    d.mkdir(parents=True, exist_ok=True)
+@pytest.fixture(scope="module")
+def shared_prompts_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Prompts tree for tests that only read it; built once per module."""
+    d = tmp_path_factory.mktemp("prompts")
+    for name, content in {
+        "greeting.j2": "Hello {{ name }}!",
+        "greeting.es.j2": "Hola {{ name }}!",
+        "welcome.en.j2": "Welcome!",
+        "welcome.es.j2": "Bienvenido!",
+        # Default-locale only: exercises the locale -> default fallback
+        "farewell.en.j2": "Goodbye {{ name }}!",
+    }.items():
+        (d / name).write_text(content, encoding="utf-8")
     return d
 
 
-def test_cli_render_basic(tmp_prompts_dir: Path, write_template, runner):
-    write_template(tmp_prompts_dir, "greeting", "Hello {{ name }}!")
+def test_cli_render_basic(shared_prompts_dir: Path, runner):
     result = runner.invoke(
         app,
         [
@@ -28,16 +36,14 @@ def test_cli_render_basic(tmp_prompts_dir: Path, write_template, runner):
             "--vars",
             '{"name": "World"}',
             "--prompts-path",
-            str(tmp_prompts_dir),
+            str(shared_prompts_dir),
         ],
     )
     assert result.exit_code == 0
     assert "Hello World!" in result.stdout
 
 
-def test_cli_render_with_locale(tmp_prompts_dir: Path, write_template, runner):
-    write_template(tmp_prompts_dir, "greeting", "Hello {{ name }}!", locale="en")
-    write_template(tmp_prompts_dir, "greeting", "Hola {{ name }}!", locale="es")
+def test_cli_render_with_locale(shared_prompts_dir: Path, runner):
     result = runner.invoke(
         app,
         [
@@ -48,17 +54,14 @@ def test_cli_render_with_locale(tmp_prompts_dir: Path, write_template, runner):
             "--vars",
             '{"name": "Mundo"}',
             "--prompts-path",
-            str(tmp_prompts_dir),
+            str(shared_prompts_dir),
         ],
     )
     assert result.exit_code == 0
     assert "Hola Mundo!" in result.stdout
 
 
-def test_cli_render_with_vars_file(
-    tmp_prompts_dir: Path, write_template, tmp_path: Path, runner
-):
-    write_template(tmp_prompts_dir, "greeting", "Hello {{ name }}!")
+def test_cli_render_with_vars_file(shared_prompts_dir: Path, tmp_path: Path, runner):
     vars_file = tmp_path / "vars.json"
     vars_file.write_text('{"name": "File"}', encoding="utf-8")
     result = runner.invoke(
@@ -69,15 +72,14 @@ def test_cli_render_with_vars_file(
             "--vars",
             f"@{vars_file}",
             "--prompts-path",
-            str(tmp_prompts_dir),
+            str(shared_prompts_dir),
         ],
     )
     assert result.exit_code == 0
     assert "Hello File!" in result.stdout
 
 
-def test_cli_render_invalid_json(tmp_prompts_dir: Path, write_template, runner):
-    write_template(tmp_prompts_dir, "greeting", "Hello World!")
+def test_cli_render_invalid_json(shared_prompts_dir: Path, runner):
     result = runner.invoke(
         app,
         [
@@ -86,7 +88,7 @@ def test_cli_render_invalid_json(tmp_prompts_dir: Path, write_template, runner):
             "--vars",
             "{invalid json}",
             "--prompts-path",
-            str(tmp_prompts_dir),
+            str(shared_prompts_dir),
         ],
     )
     assert result.exit_code != 0
@@ -94,73 +96,59 @@ def test_cli_render_invalid_json(tmp_prompts_dir: Path, write_template, runner):
     assert "JSON" in str(result.exception)  # message bubbles from Orbyte.parse_vars()
 
 
-def test_cli_list_identifiers(tmp_prompts_dir: Path, write_template, runner):
-    write_template(tmp_prompts_dir, "greeting", "Hello!")
-    write_template(tmp_prompts_dir, "welcome", "Welcome!", locale="en")
-    write_template(tmp_prompts_dir, "welcome", "Bienvenido!", locale="es")
-    result = runner.invoke(app, ["list", "--prompts-path", str(tmp_prompts_dir)])
+def test_cli_list_identifiers(shared_prompts_dir: Path, runner):
+    result = runner.invoke(app, ["list", "--prompts-path", str(shared_prompts_dir)])
     assert result.exit_code == 0
     items = {line.strip() for line in result.stdout.splitlines() if line.strip()}
     assert "greeting" in items
     assert "welcome" in items
 
 
-def test_cli_list_non_recursive_only_top_level(
-    tmp_prompts_dir: Path, write_template, runner
-):
-    write_template(tmp_prompts_dir, "root", "Top")
-    nested = tmp_prompts_dir / "nested"
-    write_template(nested, "child", "Child")
-    result = runner.invoke(
-        app, ["list", "--prompts-path", str(tmp_prompts_dir), "--non-recursive"]
-    )
-    assert result.exit_code == 0
-    items = {line.strip() for line in result.stdout.splitlines() if line.strip()}
-    assert items == {"root"}
-
-
-def test_cli_explain_resolution(tmp_prompts_dir: Path, write_template, runner):
-    write_template(tmp_prompts_dir, "greeting", "Hello!", locale="en")
+def test_cli_explain_resolution(shared_prompts_dir: Path, runner):
     result = runner.invoke(
         app,
-        ["explain", "greeting", "--locale", "es", "--prompts-path", str(tmp_prompts_dir)],
+        [
+            "explain",
+            "farewell",
+            "--locale",
+            "es",
+            "--prompts-path",
+            str(shared_prompts_dir),
+        ],
     )
     assert result.exit_code == 0
     explanation = json.loads(result.stdout)
-    assert explanation["identifier"] == "greeting"
+    assert explanation["identifier"] == "farewell"
     assert explanation["locale"] == "es"
-    assert explanation["chosen"] is not None
+    assert explanation["chosen"].endswith("farewell.en.j2")
     assert "candidates" in explanation
 
 
-def test_cli_render_missing_template(tmp_prompts_dir: Path, runner):
+def test_cli_render_missing_template(shared_prompts_dir: Path, runner):
     result = runner.invoke(
-        app, ["render", "nonexistent", "--prompts-path", str(tmp_prompts_dir)]
+        app, ["render", "nonexistent", "--prompts-path", str(shared_prompts_dir)]
     )
     assert result.exit_code != 0
 
 
-def test_cli_render_with_default_locale_fallback(
-    tmp_prompts_dir: Path, write_template, runner
-):
-    write_template(tmp_prompts_dir, "greeting", "Hello {{ name }}!", locale="en")
+def test_cli_render_with_default_locale_fallback(shared_prompts_dir: Path, runner):
     result = runner.invoke(
         app,
         [
             "render",
-            "greeting",
+            "farewell",
             "--locale",
             "fr",
             "--vars",
             '{"name": "World"}',
             "--prompts-path",
-            str(tmp_prompts_dir),
+            str(shared_prompts_dir),
             "--default-locale",
             "en",
         ],
     )
     assert result.exit_code == 0
-    assert "Hello World!" in result.stdout
+    assert "Goodbye World!" in result.stdout
 
 
 def test_cli_render_with_env_prompts_path(
@@ -208,29 +196,6 @@ def test_cli_render_empty_vars(tmp_prompts_dir: Path, write_template, runner: Cl
     assert "Hello World!" in result.stdout
 
 
-def test_gettext_translations_success_via_dummy_babel(
-    tmp_prompts_dir: Path, write_template, runner, install_dummy_babel, tmp_path: Path
-):
-    gettext_dir = tmp_path / "locale"
-    gettext_dir.mkdir()
-    write_template(tmp_prompts_dir, "greeting", "Hello {{ who }}")
-    result = runner.invoke(
-        app,
-        [
-            "render",
-            "greeting",
-            "--vars",
-            json.dumps({"who": "World"}),
-            "--prompts-path",
-            str(tmp_prompts_dir),
-            "--gettext-dir",
-            str(gettext_dir),
-        ],
-    )
-    assert result.exit_code == 0
-    assert "Hello World" in result.stdout
-
-
 def test_list_non_recursive_only_top_level(
     tmp_prompts_dir: Path, write_template, runner: CliRunner
 ):
@@ -383,3 +348,130 @@ def test_env_var_multiple_paths_dedup(tmp_path: Path, runner, monkeypatch):
     assert result.exit_code == 0
     items = {line.strip() for line in result.stdout.splitlines() if line.strip()}
     assert items == {"a"}
+
+
+def test_cli_reuses_orbyte_for_identical_invocations(
+    tmp_prompts_dir: Path, write_template, runner
+):
+    from orbyte import cli
+
+    write_template(tmp_prompts_dir, "greeting", "Hello!")
+    args = ["render", "greeting", "--prompts-path", str(tmp_prompts_dir)]
+    assert runner.invoke(app, args).exit_code == 0
+    hits = cli._build_orbyte.cache_info().hits
+    assert runner.invoke(app, args).exit_code == 0
+    assert cli._build_orbyte.cache_info().hits == hits + 1
+
+
+def test_cli_locale_only_keys_orbyte_cache_with_gettext(
+    tmp_prompts_dir: Path, write_template, runner
+):
+    from orbyte import cli
+
+    write_template(tmp_prompts_dir, "greeting", "Hello!")
+    args = ["render", "greeting", "--prompts-path", str(tmp_prompts_dir), "--locale"]
+    assert runner.invoke(app, args + ["es"]).exit_code == 0
+    hits = cli._build_orbyte.cache_info().hits
+    # Without --gettext-dir another locale reuses the same environment
+    assert runner.invoke(app, args + ["fr"]).exit_code == 0
+    assert cli._build_orbyte.cache_info().hits == hits + 1
+
+
+def test_cli_serve_rejects_gettext_dir(tmp_prompts_dir: Path, tmp_path: Path, runner):
+    result = runner.invoke(
+        app,
+        [
+            "serve",
+            "--socket",
+            str(tmp_path / "orbyte.sock"),
+            "--prompts-path",
+            str(tmp_prompts_dir),
+            "--gettext-dir",
+            str(tmp_path),
+        ],
+    )
+    assert result.exit_code == 2  # usage error: the option does not exist
+    assert not (tmp_path / "orbyte.sock").exists()
+
+
+def test_cli_serve_closes_server_on_interrupt(
+    tmp_prompts_dir: Path, tmp_path: Path, runner, monkeypatch
+):
+    import orbyte.server as server_mod
+
+    sock_path = tmp_path / "orbyte.sock"
+    closed = []
+
+    class FakeServer:
+        def serve_forever(self):
+            sock_path.write_text("", encoding="utf-8")
+            raise KeyboardInterrupt
+
+        def server_close(self):
+            closed.append(True)
+
+    monkeypatch.setattr(server_mod, "create_server", lambda path, ob: FakeServer())
+    result = runner.invoke(
+        app,
+        ["serve", "--socket", str(sock_path), "--prompts-path", str(tmp_prompts_dir)],
+    )
+    assert result.exit_code == 0, result.output
+    assert f"Listening on {sock_path}" in result.stdout
+    assert closed == [True]
+    assert not sock_path.exists()
+
+
+def test_cli_precompile_writes_zip(
+    tmp_prompts_dir: Path, write_template, tmp_path: Path, runner
+):
+    write_template(tmp_prompts_dir, "greeting", "Hello {{ name }}!")
+    target = tmp_path / "compiled.zip"
+    result = runner.invoke(
+        app, ["precompile", str(target), "--prompts-path", str(tmp_prompts_dir)]
+    )
+    assert result.exit_code == 0, result.output
+    assert target.is_file()
+
+
+def test_load_filters_reuses_namespace_until_file_changes(tmp_path: Path):
+    import os
+
+    from orbyte import cli
+
+    path = tmp_path / "filters.py"
+    path.write_text("FILTERS = {'n': lambda s: 1}\n", encoding="utf-8")
+    cached_before = len(cli._filters_cache)
+    first = cli._load_filters(str(path))
+    assert cli._load_filters(str(path)) is first
+
+    st = path.stat()
+    path.write_text("FILTERS = {'n': lambda s: 2}\n", encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    second = cli._load_filters(str(path))
+    assert second is not first
+    assert second is not None and second["n"]("x") == 2  # type: ignore[operator]
+    # The stale namespace is replaced, not kept alongside the new one
+    assert len(cli._filters_cache) == cached_before + 1
+
+
+def test_cli_import_defers_jinja2(tmp_path: Path):
+    import subprocess
+    import sys
+
+    # Fresh interpreter: this one already has jinja2 loaded
+    code = "import sys, orbyte.cli; print('jinja2' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "False"
+
+    import orbyte
+    from orbyte.env import create_env
+
+    assert orbyte.create_env is create_env
+    with pytest.raises(AttributeError):
+        orbyte.not_a_name  # noqa: B018
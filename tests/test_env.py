@@ -1,7 +1,8 @@
 from __future__ import annotations
+import os
 from pathlib import Path
 import pytest
-from jinja2 import UndefinedError
+from jinja2 import DictLoader, TemplateNotFound, UndefinedError
 from orbyte.env import create_env
 import orbyte.env as env_mod
 
@@ -20,8 +21,14 @@ def test_create_env_accepts_string_and_iterable(tmp_path: Path):
     assert e2.get_template("b.j2").render() == "B"
 
 
-def test_strict_undefined_raises(tmp_path: Path):
-    e = create_env(str(tmp_path))
+def test_create_env_accepts_loader():
+    e = create_env(DictLoader({"a.j2": "A", "b.j2": "{{ x }}"}))
+    assert e.get_template("a.j2").render() == "A"
+    assert e.get_template("b.j2").render(x="B") == "B"
+
+
+def test_strict_undefined_raises():
+    e = create_env(DictLoader({}))
     t = e.from_string("Hello {{ missing_var }}")
     with pytest.raises(UndefinedError):
         t.render()
@@ -35,6 +42,13 @@ def test_autoescape_html_enabled_but_j2_not(tmp_path: Path):
     assert e.get_template("text.j2").render(x="<b>") == "<b>"
 
 
+def test_autoescape_html_j2_templates(tmp_path: Path):
+    (tmp_path / "page.html.j2").write_text("{{ x }}", encoding="utf-8")
+    e = create_env(str(tmp_path))
+    assert e.get_template("page.html.j2").render(x="<b>") == "&lt;b&gt;"
+    assert e.from_string("{{ x }}").render(x="<b>") == "<b>"
+
+
 def test_sandbox_environment_when_available(tmp_path: Path):
     SandboxedEnvironment = getattr(env_mod, "SandboxedEnvironment", None)
     if SandboxedEnvironment is None:
@@ -64,13 +78,94 @@ def test_bytecode_cache_when_available(tmp_path: Path):
     assert isinstance(e.bytecode_cache, FSBC)  # type: ignore[arg-type]
 
 
-def test_extra_filters_are_installed_and_work(tmp_path: Path):
-    e = create_env(str(tmp_path), extra_filters={"shout": lambda v: str(v).upper() + "!"})
+def test_production_disables_auto_reload_and_enables_bytecode_cache(tmp_path: Path):
+    dev = create_env(str(tmp_path))
+    assert dev.auto_reload is True
+    assert dev.bytecode_cache is None
+
+    prod = create_env(str(tmp_path), production=True)
+    assert prod.auto_reload is False
+    # cache_size=-1: a plain dict, never evicting compiled templates
+    assert type(prod.cache) is dict and type(dev.cache) is not dict
+    if env_mod.FileSystemBytecodeCache is not None:
+        assert isinstance(prod.bytecode_cache, env_mod.FileSystemBytecodeCache)
+
+
+def test_bytecode_cache_dir_from_env_var(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache_dir = tmp_path / "bc"
+    monkeypatch.setenv("ORBYTE_BYTECODE_CACHE", str(cache_dir))
+    e = create_env(str(tmp_path))
+    if env_mod.FileSystemBytecodeCache is not None:
+        assert isinstance(e.bytecode_cache, env_mod.FileSystemBytecodeCache)
+        assert cache_dir.is_dir()
+
+
+def test_production_enabled_via_env_var(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("ORBYTE_ENV", "prod")
+    e = create_env(str(tmp_path))
+    assert e.auto_reload is False
+
+
+def test_cached_loader_reuses_source_until_mtime_changes(tmp_path: Path):
+    tpl = tmp_path / "a.j2"
+    tpl.write_text("one", encoding="utf-8")
+    loader = env_mod.CachedFileSystemLoader([str(tmp_path)])
+    e = create_env(str(tmp_path))
+    assert loader.get_source(e, "a.j2")[0] == "one"
+
+    # Same mtime: the cached source is served even though the file changed
+    st = tpl.stat()
+    tpl.write_text("two", encoding="utf-8")
+    os.utime(tpl, ns=(st.st_atime_ns, st.st_mtime_ns))
+    source, _, uptodate = loader.get_source(e, "a.j2")
+    assert source == "one" and uptodate()
+
+    os.utime(tpl, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not uptodate()
+    assert loader.get_source(e, "a.j2")[0] == "two"
+
+    # Without auto-reload the cache is trusted outright
+    e.auto_reload = False
+    tpl.unlink()
+    assert loader.get_source(e, "a.j2")[0] == "two"
+    loader.clear()
+    with pytest.raises(TemplateNotFound):
+        loader.get_source(e, "a.j2")
+
+
+def test_cached_loader_reads_large_templates_via_mmap(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(env_mod, "_MMAP_THRESHOLD", 16)
+    (tmp_path / "big.j2").write_bytes("héllo {{ x }}\r\n".encode("utf-8") * 4)
+    # A directory shadowing the name in an earlier path is skipped
+    first = tmp_path / "first"
+    (first / "big.j2").mkdir(parents=True)
+    e = create_env([str(first), str(tmp_path)])
+    assert e.get_template("big.j2").render(x=1) == "\n".join(["héllo 1"] * 4)
+
+
+def test_read_source_small_files_use_raw_reads(tmp_path: Path):
+    tpl = tmp_path / "small.j2"
+    tpl.write_bytes("héllo\r\nworld\r".encode("utf-8"))
+    size = tpl.stat().st_size
+    assert env_mod._read_source(str(tpl), size, "utf-8") == "héllo\nworld\n"
+    # A file that grew after the caller's stat is still read in full
+    assert env_mod._read_source(str(tpl), 2, "utf-8") == "héllo\nworld\n"
+    tpl.write_bytes(b"\xff")
+    with pytest.raises(UnicodeDecodeError):
+        env_mod._read_source(str(tpl), 1, "utf-8")
+
+
+def test_extra_filters_are_installed_and_work():
+    e = create_env(
+        DictLoader({}), extra_filters={"shout": lambda v: str(v).upper() + "!"}
+    )
     t = e.from_string("Hello {{ who|shout }}")
     assert t.render(who="ada") == "Hello ADA!"
 
 
-def test_translations_install_and_apply(tmp_path: Path):
+def test_translations_install_and_apply():
     class DummyTranslations:
         def gettext(self, s):
             return f"t:{s}"  # pragma: no cover
@@ -78,7 +173,7 @@ def test_translations_install_and_apply(tmp_path: Path):
         def ngettext(self, s, p, n):
             return f"t:{s if n == 1 else p}"  # pragma: no cover
 
-    e = create_env(str(tmp_path), translations=DummyTranslations())  # type: ignore[arg-type]
+    e = create_env(DictLoader({}), translations=DummyTranslations())  # type: ignore[arg-type]
     t1 = e.from_string("{% trans %}Hello{% endtrans %}")
     assert t1.render() == "t:Hello"
     t2 = e.from_string("{% trans count=2 %}item{% pluralize %}items{% endtrans %}")
@@ -1,5 +1,6 @@
 import os
 import json
+import runpy
 import subprocess
 import sys
 from pathlib import Path
@@ -9,6 +10,7 @@ import pytest
 
 from orbyte import Orbyte
 from orbyte.exceptions import TemplateLookupError
+from orbyte.validation import OrbyteConfigError
 
 
 def write_template(
@@ -78,6 +80,19 @@ def run_cli(cwd: str, args: list[str], env: Optional[dict] = None):
     )
 
 
+def run_cli_in_process(args: list[str], monkeypatch, capsys):
+    """Run the `python -m orbyte` script in this interpreter: (returncode, stdout)."""
+    script = Path(__file__).resolve().parents[1] / "orbyte.py"
+    monkeypatch.setattr(sys, "argv", [str(script), *args])
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    return code, capsys.readouterr().out
+
+
+# The one subprocess smoke test for `python -m orbyte`; the rest run in-process.
 def test_cli_renders_with_vars_and_locale(tmp_path: Path, tmp_prompts_dir: Path):
     write_template(tmp_prompts_dir, "welcome_email", "Hola {{ name }}", locale="es")
     out = run_cli(
@@ -97,40 +112,243 @@ def test_cli_renders_with_vars_and_locale(tmp_path: Path, tmp_prompts_dir: Path)
     assert out.stdout.strip() == "Hola Wilbur"
 
 
-def test_cli_errors_on_invalid_json(tmp_path: Path, tmp_prompts_dir: Path):
+def test_cli_errors_on_invalid_json(tmp_prompts_dir: Path, monkeypatch, capsys):
     write_template(tmp_prompts_dir, "welcome_email", "Hello", locale="en")
-    out = run_cli(
-        cwd=str(Path(__file__).resolve().parents[1]),
-        args=[
+    code, out = run_cli_in_process(
+        [
             "welcome_email",
             "--vars",
             "{not-json}",
             "--prompts-path",
             str(tmp_prompts_dir),
         ],
+        monkeypatch,
+        capsys,
     )
 
-    assert out.returncode == 1
-    assert "Invalid JSON" in (out.stdout + out.stderr)
+    assert code == 1
+    assert "Invalid JSON" in out
 
 
 def test_cli_uses_env_prompts_path_when_flag_not_provided(
-    tmp_path: Path, tmp_prompts_dir: Path, monkeypatch: pytest.MonkeyPatch
+    tmp_prompts_dir: Path, monkeypatch: pytest.MonkeyPatch, capsys
 ):
     write_template(tmp_prompts_dir, "welcome_email", "Hello {{ name }}", locale="en")
+    monkeypatch.setenv("ORBYTE_PROMPTS_PATH", str(tmp_prompts_dir))
 
-    env = os.environ.copy()
-    env["ORBYTE_PROMPTS_PATH"] = str(tmp_prompts_dir)
+    code, out = run_cli_in_process(
+        ["welcome_email", "--vars", json.dumps({"name": "Wilbur"})],
+        monkeypatch,
+        capsys,
+    )
 
-    out = run_cli(
-        cwd=str(Path(__file__).resolve().parents[1]),
-        args=[
-            "welcome_email",
-            "--vars",
-            json.dumps({"name": "Wilbur"}),
-        ],
-        env=env,
+    assert code == 0
+    assert out.strip() == "Hello Wilbur"
+
+
+def test_production_render_caches_lookup(tmp_prompts_dir: Path, monkeypatch):
+    import orbyte.core as core_mod
+
+    monkeypatch.setattr(core_mod, "_LOOKUP_CACHE_SIZE", 1)
+    write_template(tmp_prompts_dir, "welcome_email", "Hello {{ name }}", locale="en")
+    write_template(tmp_prompts_dir, "farewell", "Bye", locale="en")
+    prod = Orbyte([str(tmp_prompts_dir)], production=True)
+    dev = Orbyte([str(tmp_prompts_dir)])
+    for ob in (prod, dev):
+        assert (
+            ob.render("welcome_email", {"name": "Wilbur"}, locale="es") == "Hello Wilbur"
+        )
+
+    # A new locale file is picked up in dev mode; production keeps its answer.
+    write_template(tmp_prompts_dir, "welcome_email", "Hola {{ name }}", locale="es")
+    assert dev.render("welcome_email", {"name": "Wilbur"}, locale="es") == "Hola Wilbur"
+    assert prod.render("welcome_email", {"name": "Wilbur"}, locale="es") == "Hello Wilbur"
+
+    # Bounded: caching another lookup evicts the oldest one.
+    assert prod.render("farewell") == "Bye"
+    assert list(prod._lookup_cache) == [("farewell", None)]
+
+
+def test_production_template_cache_and_clear(tmp_prompts_dir: Path):
+    write_template(tmp_prompts_dir, "welcome_email", "Hello {{ name }}", locale="en")
+    ob = Orbyte([str(tmp_prompts_dir)], production=True)
+    assert ob.render("welcome_email", {"name": "Wilbur"}) == "Hello Wilbur"
+
+    write_template(tmp_prompts_dir, "welcome_email", "Hi {{ name }}", locale="en")
+    assert ob.render("welcome_email", {"name": "Wilbur"}) == "Hello Wilbur"
+
+    ob.clear_template_cache()
+    assert ob.render("welcome_email", {"name": "Wilbur"}) == "Hi Wilbur"
+
+
+def test_dev_template_cache_rechecks_mtime(tmp_prompts_dir: Path):
+    path = tmp_prompts_dir / "welcome_email.j2"
+    path.write_text("Hello {{ name }}", encoding="utf-8")
+    ob = Orbyte([str(tmp_prompts_dir)])
+    assert ob.render("welcome_email", {"name": "Wilbur"}) == "Hello Wilbur"
+    cached = ob._tpl_cache["welcome_email.j2"]
+    assert ob._template("welcome_email.j2") is cached
+
+    st = path.stat()
+    path.write_text("Hi {{ name }}", encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert ob.render("welcome_email", {"name": "Wilbur"}) == "Hi Wilbur"
+    assert ob._tpl_cache["welcome_email.j2"] is not cached
+
+
+def test_render_many_preserves_order_and_loads_each_template_once(
+    tmp_prompts_dir: Path, monkeypatch
+):
+    write_template(tmp_prompts_dir, "welcome_email", "Hola {{ name }}", locale="es")
+    write_template(tmp_prompts_dir, "welcome_email", "Hello {{ name }}", locale="en")
+    ob = Orbyte([str(tmp_prompts_dir)], default_locale="en")
+    calls = []
+    original = Orbyte._get_template
+
+    def spy(self, identifier, locale):
+        calls.append((identifier, locale))
+        return original(self, identifier, locale)
+
+    monkeypatch.setattr(Orbyte, "_get_template", spy)
+
+    out = ob.render_many(
+        [
+            ("welcome_email", {"name": "A"}, "es"),
+            ("welcome_email", {"name": "B"}, None),
+            ("welcome_email", {"name": "C"}, "es"),
+        ]
     )
 
-    assert out.returncode == 0
-    assert out.stdout.strip() == "Hello Wilbur"
+    assert out == ["Hola A", "Hello B", "Hola C"]
+    assert calls == [("welcome_email", "es"), ("welcome_email", None)]
+
+
+def test_render_many_missing_variable_raises(tmp_prompts_dir: Path):
+    from orbyte.exceptions import MissingVariableError
+
+    write_template(tmp_prompts_dir, "welcome_email", "Hello {{ name }}")
+    ob = Orbyte([str(tmp_prompts_dir)])
+    with pytest.raises(MissingVariableError):
+        ob.render_many([("welcome_email", {}, None)])
+
+
+def test_render_many_validates_all_identifiers_first(tmp_prompts_dir: Path, monkeypatch):
+    write_template(tmp_prompts_dir, "welcome_email", "Hello")
+    ob = Orbyte([str(tmp_prompts_dir)])
+    monkeypatch.setattr(Orbyte, "_get_template", lambda *a: pytest.fail("rendered"))
+    with pytest.raises(OrbyteConfigError):
+        ob.render_many([("welcome_email", {}, None), ("../secret", {}, None)])
+
+
+def test_prepare_binds_template_in_production(tmp_prompts_dir: Path, monkeypatch):
+    from orbyte.exceptions import MissingVariableError
+
+    write_template(tmp_prompts_dir, "welcome_email", "Hola {{ name }}", locale="es")
+    ob = Orbyte([str(tmp_prompts_dir)], production=True)
+    greet = ob.prepare("welcome_email", locale="es")
+    monkeypatch.setattr(Orbyte, "_get_template", lambda *a: pytest.fail("resolved"))
+    assert greet({"name": "Ada"}) == "Hola Ada"
+    assert greet({"name": "Grace"}) == "Hola Grace"
+    with pytest.raises(MissingVariableError):
+        greet({})
+
+
+def test_prepare_follows_edits_in_dev_mode(tmp_prompts_dir: Path):
+    write_template(tmp_prompts_dir, "welcome_email", "Hello {{ name }}")
+    ob = Orbyte([str(tmp_prompts_dir)])
+    greet = ob.prepare("welcome_email", locale="es")
+    assert greet({"name": "Ada"}) == "Hello Ada"
+    write_template(tmp_prompts_dir, "welcome_email", "Hola {{ name }}", locale="es")
+    assert greet({"name": "Ada"}) == "Hola Ada"
+
+
+def test_prepare_raises_lookup_errors_eagerly(tmp_prompts_dir: Path):
+    ob = Orbyte([str(tmp_prompts_dir)])
+    with pytest.raises(TemplateLookupError):
+        ob.prepare("missing")
+
+
+def test_render_accepts_path_search_paths(tmp_path: Path):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+    write_template(tmp_path / "b", "welcome_email", "Hello {{ name }}")
+    ob = Orbyte([tmp_path / "a", tmp_path / "b"])
+    assert ob.render("welcome_email", {"name": "Ada"}) == "Hello Ada"
+
+
+def test_render_accepts_str_enum_identifiers(tmp_prompts_dir: Path):
+    from enum import Enum
+
+    class Prompt(str, Enum):
+        WELCOME = "welcome_email"
+
+    write_template(tmp_prompts_dir, "welcome_email", "Hello {{ name }}")
+    ob = Orbyte([str(tmp_prompts_dir)])
+    assert ob.render(Prompt.WELCOME, {"name": "Ada"}) == "Hello Ada"
+    assert ob.explain(Prompt.WELCOME)["identifier"] == "welcome_email"
+
+
+def test_orbyte_supports_weak_references(tmp_prompts_dir: Path):
+    import weakref
+
+    ob = Orbyte([str(tmp_prompts_dir)])
+    assert weakref.ref(ob)() is ob
+    assert not hasattr(ob, "__dict__")
+
+
+def test_render_with_empty_search_path_uses_cwd(tmp_prompts_dir: Path, monkeypatch):
+    write_template(tmp_prompts_dir, "welcome_email", "Hello {{ name }}")
+    monkeypatch.chdir(tmp_prompts_dir)
+    assert Orbyte([""]).render("welcome_email", {"name": "Ada"}) == "Hello Ada"
+
+
+def test_to_loader_name_uses_posix_relative_name(tmp_prompts_dir: Path, tmp_path: Path):
+    from orbyte.exceptions import TemplateLookupError
+
+    (tmp_prompts_dir / "emails").mkdir()
+    write_template(tmp_prompts_dir, "emails/welcome", "Hi")
+    ob = Orbyte([str(tmp_prompts_dir)])
+    chosen = tmp_prompts_dir / "emails" / "welcome.j2"
+    assert ob._to_loader_name(chosen) == "emails/welcome.j2"
+
+    outside = tmp_path / "elsewhere.j2"
+    outside.write_text("x", encoding="utf-8")
+    with pytest.raises(TemplateLookupError):
+        ob._to_loader_name(outside)
+
+
+def test_parse_vars_large_file_is_parsed_from_mmap(tmp_path: Path, monkeypatch):
+    import orbyte.core as core_mod
+
+    seen = []
+
+    def fake_orjson_loads(data):
+        seen.append(type(data))
+        return json.loads(bytes(data))
+
+    monkeypatch.setattr(core_mod, "orjson", object())
+    monkeypatch.setattr(core_mod, "_loads", fake_orjson_loads)
+    monkeypatch.setattr(core_mod, "_MMAP_VARS_THRESHOLD", 8)
+    vars_file = tmp_path / "vars.json"
+    vars_file.write_text(json.dumps({"name": "x" * 32}), encoding="utf-8")
+    assert Orbyte.parse_vars(f"@{vars_file}") == {"name": "x" * 32}
+    assert seen == [memoryview]
+
+
+def test_parse_vars_falls_back_to_json_for_non_strict_input(monkeypatch):
+    import math
+    import types
+
+    import orbyte.core as core_mod
+
+    def strict_loads(data):
+        if "NaN" in data:
+            raise json.JSONDecodeError("NaN is not strict JSON", data, 0)
+        return json.loads(data)
+
+    fake = types.SimpleNamespace(loads=strict_loads, JSONDecodeError=json.JSONDecodeError)
+    monkeypatch.setattr(core_mod, "orjson", fake)
+    assert Orbyte.parse_vars('{"n": 1}') == {"n": 1}
+    assert math.isnan(Orbyte.parse_vars('{"x": NaN}')["x"])
+    with pytest.raises(OrbyteConfigError, match="must be valid JSON"):
+        Orbyte.parse_vars('{"x": NaN')
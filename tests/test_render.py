@@ -26,3 +26,32 @@ def test_template_not_found(tmp_path: Path):
     ob = Orbyte([str(base)])
     with pytest.raises(TemplateLookupError):
         ob.render("missing", {"x": 1})
+
+
+def test_precompile_serves_compiled_templates(tmp_path: Path, monkeypatch):
+    base = tmp_path / "prompts"
+    base.mkdir()
+    (base / "hello.en.j2").write_text("Hello {{ name }}!")
+    compiled = tmp_path / "compiled"
+    Orbyte([str(base)]).precompile(str(compiled), zip=None)
+    assert any(compiled.iterdir())
+
+    # The compiled module wins over the (changed) source once configured.
+    (base / "hello.en.j2").write_text("Changed {{ name }}!")
+    monkeypatch.setenv("ORBYTE_COMPILED_DIR", str(compiled))
+    ob = Orbyte([str(base)])
+    assert ob.render("hello", {"name": "Ada"}) == "Hello Ada!"
+
+
+def test_precompile_skips_non_template_files(tmp_path: Path):
+    base = tmp_path / "prompts"
+    (base / ".git").mkdir(parents=True)
+    (base / "venv").mkdir()
+    (base / "hello.j2").write_text("Hello {{ name }}!")
+    # None of these parse as Jinja templates
+    (base / "README.md").write_text("Use {% like this")
+    (base / ".git" / "HEAD.j2").write_text("{% broken")
+    (base / "venv" / "x.j2").write_text("{% broken")
+    compiled = tmp_path / "compiled"
+    Orbyte([str(base)]).precompile(str(compiled), zip=None)
+    assert len(list(compiled.iterdir())) == 1
@@ -1,9 +1,11 @@
+import os
+import time
 from pathlib import Path
 from typing import List, Optional
 
 import pytest
 
-from orbyte.resolver import PromptResolver, Resolution
+from orbyte.resolver import PromptResolver, Resolution, _candidate_names
 from orbyte.validation import OrbyteConfigError
 
 
@@ -27,6 +29,12 @@ def resolver_single_path(tmp_prompts_dir: Path) -> PromptResolver:
     return PromptResolver([str(tmp_prompts_dir)], default_locale="en")
 
 
+@pytest.fixture(scope="module")
+def readonly_resolver(tmp_path_factory: pytest.TempPathFactory) -> PromptResolver:
+    """Resolver over an empty directory, shared by tests that never write to it."""
+    return PromptResolver([str(tmp_path_factory.mktemp("empty"))], default_locale="en")
+
+
 @pytest.fixture()
 def resolver_multi_path(tmp_path: Path) -> tuple[PromptResolver, List[Path]]:
     paths = []
@@ -78,8 +86,8 @@ def test_resolve_fallback_to_plain_identifier(
     assert result.chosen.name == "greeting.j2"
 
 
-def test_resolve_no_match_found(resolver_single_path: PromptResolver):
-    result = resolver_single_path.resolve("nonexistent", locale="en")
+def test_resolve_no_match_found(readonly_resolver: PromptResolver):
+    result = readonly_resolver.resolve("nonexistent", locale="en")
 
     assert result.identifier == "nonexistent"
     assert result.locale == "en"
@@ -124,19 +132,19 @@ def test_resolve_priority_first_path_wins(resolver_multi_path, tmp_path: Path):
     assert "prompts0" in str(result.chosen)
 
 
-def test_resolve_invalid_identifier(resolver_single_path: PromptResolver):
+def test_resolve_invalid_identifier(readonly_resolver: PromptResolver):
     with pytest.raises(OrbyteConfigError, match="must not be absolute"):
-        resolver_single_path.resolve("/absolute/path")
+        readonly_resolver.resolve("/absolute/path")
 
 
-def test_resolve_identifier_with_parent_traversal(resolver_single_path: PromptResolver):
+def test_resolve_identifier_with_parent_traversal(readonly_resolver: PromptResolver):
     with pytest.raises(OrbyteConfigError, match="must not contain"):
-        resolver_single_path.resolve("../escape")
+        readonly_resolver.resolve("../escape")
 
 
-def test_resolve_identifier_with_j2_extension(resolver_single_path: PromptResolver):
+def test_resolve_identifier_with_j2_extension(readonly_resolver: PromptResolver):
     with pytest.raises(OrbyteConfigError, match="must not include the '.j2' extension"):
-        resolver_single_path.resolve("template.j2")
+        readonly_resolver.resolve("template.j2")
 
 
 def test_resolve_complex_identifier_path(
@@ -153,8 +161,8 @@ def test_resolve_complex_identifier_path(
     assert result.chosen.name == "welcome.en.j2"
 
 
-def test_list_identifiers_empty_directory(resolver_single_path: PromptResolver):
-    identifiers = resolver_single_path.list_identifiers()
+def test_list_identifiers_empty_directory(readonly_resolver: PromptResolver):
+    identifiers = readonly_resolver.list_identifiers()
     assert identifiers == []
 
 
@@ -255,3 +263,172 @@ def test_list_identifiers_non_recursive(
     # Only top-level identifiers
     identifiers = resolver_single_path.list_identifiers(recursive=False)
     assert identifiers == ["root"]
+
+
+def test_resolve_reuses_directory_listing_until_mtime_changes(
+    resolver_single_path: PromptResolver, tmp_prompts_dir: Path
+):
+    write_template(tmp_prompts_dir, "greeting", "Hello!", locale="en")
+    old = time.time() - 60
+    os.utime(tmp_prompts_dir, (old, old))
+    assert (
+        resolver_single_path.resolve("greeting", "es").chosen
+        == tmp_prompts_dir / "greeting.en.j2"
+    )
+
+    # Same directory mtime -> the cached listing is used (new file unseen)
+    write_template(tmp_prompts_dir, "greeting", "Hola!", locale="es")
+    os.utime(tmp_prompts_dir, (old, old))
+    assert (
+        resolver_single_path.resolve("greeting", "es").chosen
+        == tmp_prompts_dir / "greeting.en.j2"
+    )
+
+    # Directory changed -> re-scanned
+    os.utime(tmp_prompts_dir, (old + 1, old + 1))
+    assert (
+        resolver_single_path.resolve("greeting", "es").chosen
+        == tmp_prompts_dir / "greeting.es.j2"
+    )
+
+
+def test_resolve_recently_modified_directory_is_not_cached(
+    resolver_single_path: PromptResolver, tmp_prompts_dir: Path
+):
+    write_template(tmp_prompts_dir, "greeting", "Hello!", locale="en")
+    assert resolver_single_path.resolve("greeting", "es").chosen is not None
+    write_template(tmp_prompts_dir, "greeting", "Hola!", locale="es")
+    assert (
+        resolver_single_path.resolve("greeting", "es").chosen
+        == tmp_prompts_dir / "greeting.es.j2"
+    )
+
+
+def test_list_identifiers_skips_hidden_and_excluded_dirs(
+    resolver_single_path: PromptResolver, tmp_prompts_dir: Path
+):
+    for d in (".git", ".hidden", "__pycache__", "venv"):
+        (tmp_prompts_dir / d).mkdir()
+        write_template(tmp_prompts_dir / d, "ignored", "x")
+    write_template(tmp_prompts_dir, "kept", "y", locale="en")
+
+    assert resolver_single_path.list_identifiers() == ["kept"]
+
+
+def test_resolution_has_no_instance_dict(tmp_prompts_dir: Path):
+    (tmp_prompts_dir / "a.j2").write_text("A", encoding="utf-8")
+    res = PromptResolver([str(tmp_prompts_dir)]).resolve("a")
+    assert not hasattr(res, "__dict__")
+
+
+def test_resolution_survives_copy_and_pickle(tmp_prompts_dir: Path):
+    import copy
+    import pickle
+
+    (tmp_prompts_dir / "a.j2").write_text("A", encoding="utf-8")
+    res = PromptResolver([str(tmp_prompts_dir)]).resolve("a", "es")
+    for clone in (copy.copy(res), copy.deepcopy(res), pickle.loads(pickle.dumps(res))):
+        assert clone == res and clone is not res
+
+
+def test_resolve_cache_memoizes_until_cleared(tmp_prompts_dir: Path, monkeypatch):
+    (tmp_prompts_dir / "a.j2").write_text("A", encoding="utf-8")
+    resolver = PromptResolver([str(tmp_prompts_dir)], cache=True)
+    first = resolver.resolve("a", "en_US")
+    assert resolver.resolve("a", "en-US") is first
+
+    # Cached hits don't see new files; clear_cache() does
+    (tmp_prompts_dir / "a.en-US.j2").write_text("A-US", encoding="utf-8")
+    assert resolver.resolve("a", "en-US").chosen == tmp_prompts_dir / "a.j2"
+    resolver.clear_cache()
+    assert resolver.resolve("a", "en-US").chosen == tmp_prompts_dir / "a.en-US.j2"
+
+    # Misses aren't cached; the oldest entry is evicted at the size cap
+    assert resolver.resolve("missing").chosen is None
+    assert ("missing", "en") not in resolver._resolve_cache
+    monkeypatch.setattr("orbyte.resolver._RESOLVE_CACHE_SIZE", 1)
+    resolver.resolve("a", "fr")
+    assert list(resolver._resolve_cache) == [("a", "fr")]
+
+
+def test_resolve_ignores_directories_named_like_templates(tmp_prompts_dir: Path):
+    (tmp_prompts_dir / "a.en.j2").mkdir()
+    (tmp_prompts_dir / "a.j2").write_text("A", encoding="utf-8")
+    res = PromptResolver([str(tmp_prompts_dir)]).resolve("a", "en")
+    assert res.chosen == tmp_prompts_dir / "a.j2"
+
+
+def test_list_identifiers_does_not_follow_directory_symlinks(tmp_path: Path):
+    prompts = tmp_path / "prompts"
+    (prompts / "emails").mkdir(parents=True)
+    (prompts / "emails" / "welcome.en.j2").write_text("W", encoding="utf-8")
+    (prompts / "notes.txt").write_text("x", encoding="utf-8")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "leak.j2").write_text("L", encoding="utf-8")
+    try:
+        (prompts / "linked").symlink_to(outside, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+    assert PromptResolver([str(prompts)]).list_identifiers() == ["emails/welcome"]
+
+
+def test_list_identifiers_unsorted_keeps_search_path_order(tmp_path: Path):
+    p1 = tmp_path / "p1"
+    p2 = tmp_path / "p2"
+    p1.mkdir()
+    p2.mkdir()
+    (p1 / "zeta.j2").write_text("Z", encoding="utf-8")
+    (p2 / "alpha.en.j2").write_text("A", encoding="utf-8")
+    (p2 / "zeta.en.j2").write_text("Z", encoding="utf-8")
+    resolver = PromptResolver([str(p1), str(p2)])
+    assert resolver.list_identifiers(sort=False) == ["zeta", "alpha"]
+    assert resolver.list_identifiers() == ["alpha", "zeta"]
+
+
+def test_candidate_names_are_ranked_and_memoized():
+    _candidate_names.cache_clear()
+    assert _candidate_names("greeting", "es", "en") == (
+        "greeting.es.j2",
+        "greeting.en.j2",
+        "greeting.j2",
+    )
+    assert _candidate_names("greeting", "en", "en") == ("greeting.en.j2", "greeting.j2")
+    _candidate_names("greeting", "es", "en")
+    assert _candidate_names.cache_info().hits == 1
+
+
+def test_resolve_validates_each_identifier_once(tmp_prompts_dir: Path, monkeypatch):
+    import orbyte.resolver as resolver_mod
+
+    calls: List[str] = []
+    real = resolver_mod.canonical_identifier
+
+    def spy(identifier: str) -> str:
+        calls.append(identifier)
+        return real(identifier)
+
+    monkeypatch.setattr(resolver_mod, "canonical_identifier", spy)
+    resolver = PromptResolver([str(tmp_prompts_dir)])
+    resolver.resolve("greeting")
+    resolver.resolve("greeting", "es")
+    assert calls == ["greeting"]
+    for _ in range(2):
+        with pytest.raises(OrbyteConfigError):
+            resolver.resolve("../secret")
+    assert calls == ["greeting", "../secret", "../secret"]
+
+
+def test_resolve_accepts_str_subclass_identifiers(tmp_prompts_dir: Path):
+    from enum import Enum
+
+    class Prompt(str, Enum):
+        GREETING = "emails/greeting"
+
+    (tmp_prompts_dir / "emails").mkdir()
+    (tmp_prompts_dir / "emails" / "greeting.en.j2").write_text("Hi", encoding="utf-8")
+    resolver = PromptResolver([str(tmp_prompts_dir)])
+    for _ in range(2):
+        res = resolver.resolve(Prompt.GREETING)
+        assert type(res.identifier) is str and res.identifier == "emails/greeting"
+        assert res.chosen == tmp_prompts_dir / "emails" / "greeting.en.j2"
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from orbyte.core import Orbyte
+from orbyte.server import create_server, handle_request
+
+
+def test_handle_request_renders_and_reports_errors(tmp_prompts_dir: Path, write_template):
+    write_template(tmp_prompts_dir, "greeting", "Hola {{ name }}!", locale="es")
+    ob = Orbyte([str(tmp_prompts_dir)])
+
+    ok = handle_request(
+        ob, {"identifier": "greeting", "vars": {"name": "Ada"}, "locale": "es"}
+    )
+    assert ok == {"ok": True, "output": "Hola Ada!"}
+
+    missing = handle_request(ob, {"identifier": "nope"})
+    assert missing["ok"] is False
+    assert missing["type"] == "TemplateLookupError"
+
+    bad = handle_request(ob, ["not", "a", "mapping"])  # type: ignore[arg-type]
+    assert bad["ok"] is False
+    assert bad["type"] == "OrbyteConfigError"
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs UNIX sockets")
+def test_server_renders_requests_over_socket(tmp_prompts_dir: Path, write_template):
+    write_template(tmp_prompts_dir, "greeting", "Hello {{ name }}!")
+    sock_path = str(tmp_prompts_dir.parent / "orbyte.sock")
+    server = create_server(sock_path, Orbyte([str(tmp_prompts_dir)]))
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(sock_path)
+            f = client.makefile("rwb")
+            f.write(b'{"identifier": "greeting", "vars": {"name": "Ada"}}\n')
+            f.write(b"{not json}\n")
+            f.flush()
+            first = json.loads(f.readline())
+            second = json.loads(f.readline())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first == {"ok": True, "output": "Hello Ada!"}
+    assert second["ok"] is False
+    assert "Invalid JSON" in second["error"]
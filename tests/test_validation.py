@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 from pathlib import Path
 
@@ -5,6 +7,8 @@ from orbyte.core import Orbyte
 from orbyte.validation import (
     OrbyteConfigError,
     assert_valid_identifier,
+    assert_valid_identifiers,
+    canonical_identifier,
     normalize_locale,
     assert_valid_paths,
     assert_mapping,
@@ -68,6 +72,43 @@ def test_identifier_validation_empty_and_non_string():
     with pytest.raises(OrbyteConfigError):
         assert_valid_identifier(123)  # type: ignore[arg-type]
 
+    class Ambiguous:
+        def __bool__(self):
+            raise ValueError("truth value is ambiguous")
+
+    # The type is checked before truthiness, so odd objects still get a config error
+    with pytest.raises(OrbyteConfigError):
+        assert_valid_identifier(Ambiguous())  # type: ignore[arg-type]
+
+
+def test_identifier_validation_is_memoized_for_valid_strings():
+    from orbyte import validation
+
+    cache_info = validation._assert_valid_identifier_cached.cache_info
+    assert_valid_identifier("memo/welcome")
+    hits = cache_info().hits
+    assert_valid_identifier("memo/welcome")
+    assert cache_info().hits == hits + 1
+    # Unhashable input still gets the usual config error
+    with pytest.raises(OrbyteConfigError):
+        assert_valid_identifier(["welcome"])  # type: ignore[arg-type]
+
+
+def test_assert_valid_identifiers_reports_first_invalid():
+    assert_valid_identifiers(["a", "emails/welcome", "x.y-z_1"])
+    with pytest.raises(OrbyteConfigError, match="must not contain '..'"):
+        assert_valid_identifiers(["a", "b/../c", "/abs"])
+    with pytest.raises(OrbyteConfigError, match="non-empty string"):
+        assert_valid_identifiers(["a", ""])
+
+
+def test_canonical_identifier_and_locale_are_interned():
+    built = "".join(["emails/", "welcome"])
+    assert canonical_identifier(built) is sys.intern("emails/welcome")
+    assert normalize_locale("pt_BR", "en") is sys.intern("pt-BR")
+    with pytest.raises(OrbyteConfigError):
+        canonical_identifier("../x")
+
 
 def test_identifier_validation_blocks_absolute_path(tmp_path: Path):
     # absolute path should be rejected
@@ -76,12 +117,35 @@ def test_identifier_validation_blocks_absolute_path(tmp_path: Path):
         assert_valid_identifier(abs_ident)
 
 
+@pytest.mark.parametrize(
+    "identifier, message",
+    [
+        ("\\\\server\\share", "must not be absolute"),
+        ("C:/prompts/welcome", "must not be absolute"),
+        ("emails/../secret", "must not contain '..'"),
+        ("emails\\..\\secret", "must not contain '..'"),
+    ],
+)
+def test_identifier_validation_windows_style_paths(identifier: str, message: str):
+    with pytest.raises(OrbyteConfigError, match=message):
+        assert_valid_identifier(identifier)
+
+
 def test_identifier_validation_blocks_invalid_chars():
     # spaces or $ should fail the allowed pattern
     with pytest.raises(OrbyteConfigError):
         assert_valid_identifier("welcome template")
     with pytest.raises(OrbyteConfigError):
         assert_valid_identifier("welcome$prod")
+    # `$` used to accept a trailing newline; fullmatch does not
+    with pytest.raises(OrbyteConfigError):
+        assert_valid_identifier("welcome\n")
+
+
+@pytest.mark.parametrize("loc", ["e", "éé", "e1", "enUS"])
+def test_normalize_locale_rejects_non_ascii_and_bad_lengths(loc: str):
+    with pytest.raises(OrbyteConfigError):
+        normalize_locale(loc, default_locale="en")
 
 
 def test_normalize_locale_underscore_to_hyphen_and_empty_raises():
@@ -92,6 +156,22 @@ def test_normalize_locale_underscore_to_hyphen_and_empty_raises():
         normalize_locale(None, default_locale="")
 
 
+def test_assert_valid_paths_accepts_path_objects(tmp_path: Path):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+    # Siblings go through the shared-parent scan; the '..' one through stat
+    assert_valid_paths([tmp_path / "a", tmp_path / "b", tmp_path / "a" / ".."])
+    with pytest.raises(OrbyteConfigError, match="does not exist"):
+        assert_valid_paths([tmp_path / "a", tmp_path / "missing"])
+
+
+def test_assert_valid_paths_treats_empty_path_as_cwd(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a").mkdir()
+    assert_valid_paths(["", "a"])
+    assert_valid_paths([Path("")])
+
+
 def test_assert_valid_paths_raises_when_path_is_file(tmp_path: Path):
     f = tmp_path / "not_a_dir.txt"
     f.write_text("x", encoding="utf-8")
@@ -100,6 +180,36 @@ def test_assert_valid_paths_raises_when_path_is_file(tmp_path: Path):
     assert "not a directory" in str(e.value)
 
 
+def test_assert_valid_paths_sibling_directories(tmp_path: Path):
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "f.txt").write_text("x", encoding="utf-8")
+    siblings = [str(tmp_path / n) for n in ("a", "b", "c")] + [str(tmp_path / "a" / "..")]
+    assert_valid_paths(siblings)
+
+    # Errors are still reported in input order
+    with pytest.raises(OrbyteConfigError, match="does not exist"):
+        assert_valid_paths(
+            siblings + [str(tmp_path / "missing"), str(tmp_path / "f.txt")]
+        )
+    with pytest.raises(OrbyteConfigError, match="not a directory"):
+        assert_valid_paths(
+            siblings + [str(tmp_path / "f.txt"), str(tmp_path / "missing")]
+        )
+
+
+def test_assert_valid_paths_sibling_symlinks_are_stat_checked(tmp_path: Path):
+    (tmp_path / "a").mkdir()
+    try:
+        (tmp_path / "link").symlink_to(tmp_path / "a")
+        (tmp_path / "dangling").symlink_to(tmp_path / "nowhere")
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+    assert_valid_paths([str(tmp_path / "a"), str(tmp_path / "link")])
+    with pytest.raises(OrbyteConfigError, match="does not exist"):
+        assert_valid_paths([str(tmp_path / "a"), str(tmp_path / "dangling")])
+
+
 def test_assert_mapping_accepts_none_and_rejects_non_mapping():
     # None is allowed (no-op)
     assert_mapping("vars", None)